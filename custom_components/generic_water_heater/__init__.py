@@ -1,16 +1,17 @@
 """The generic_water_heater integration."""
 import logging
 
-from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
-from homeassistant.components.select import DOMAIN as SELECT_DOMAIN
-from homeassistant.components.water_heater import DOMAIN as WATER_HEATER_DOMAIN
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_NAME, Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+from .runtime import GenericWaterHeaterRuntime
 
 _LOGGER = logging.getLogger(__name__)
 
 DOMAIN = "generic_water_heater"
-PLATFORMS = [WATER_HEATER_DOMAIN, SENSOR_DOMAIN, SELECT_DOMAIN]
+PLATFORMS = [Platform.WATER_HEATER, Platform.SENSOR, Platform.SELECT]
 
 CONF_HEATER = "heater_switch"
 CONF_SENSOR = "temperature_sensor"
@@ -23,27 +24,61 @@ CONF_TEMP_MAX = "max_temp"
 CONF_MIN_ON_DURATION = "min_on_duration"
 CONF_MIN_OFF_DURATION = "min_off_duration"
 CONF_ECO_TEMPLATE = "eco_mode_template_condition"
+CONF_ECO_CONDITIONS = "eco_conditions"
+CONF_ECO_PRICE_SENSOR = "eco_price_sensor"
+CONF_ECO_PRICE_CHEAPEST_SLOTS = "eco_price_cheapest_slots"
+CONF_ECO_PRICE_PERCENTILE = "eco_price_percentile"
+CONF_ECO_SURPLUS_SENSOR = "eco_surplus_sensor"
+CONF_ECO_SURPLUS_POWER = "eco_surplus_power"
+CONF_ECO_SURPLUS_WINDOW_MINUTES = "eco_surplus_window_minutes"
 CONF_DEBUG_LOGGING = "enable_debug_logging"
 CONF_ENABLE_MAX_TEMP_HISTORY_SENSOR = "enable_max_temp_history_sensor"
+CONF_MAX_TEMP_HISTORY_BUCKET_MINUTES = "max_temp_history_bucket_minutes"
+CONF_ENABLE_TEMPERATURE_STATISTICS_SENSORS = "enable_temperature_statistics_sensors"
 CONF_SMART_ECO_MANUAL_OFF_RESUME_HOURS = "smart_eco_manual_off_resume_hours"
+CONF_SMART_ECO_COUNTDOWN_STATE = "smart_eco_countdown_state"
+CONF_SWITCH_CONFIRM_TIMEOUT = "switch_confirm_timeout"
+CONF_SCHEDULE = "schedule"
+CONF_ELEMENT_POWER_KW = "element_power_kw"
+CONF_TURN_ON_PRIORITY = "turn_on_priority"
+CONF_SITE_MAX_HEATERS_ON = "site_max_heaters_on"
+CONF_SITE_MAX_POWER_KW = "site_max_power_kw"
+CONF_SITE_TURN_ON_STAGGER = "site_turn_on_stagger_seconds"
+CONF_SITE_TURN_ON_MAX_DELAY = "site_turn_on_max_delay_seconds"
 
 SMART_ECO_MODE_OFF = "off"
 SMART_ECO_MODE_UNTIL_MANUAL = "until_manual"
 SMART_ECO_MODE_AUTO_RESUME = "auto_resume"
 SMART_ECO_MODE_ALWAYS_ON = "always_on"
 
+# Options that add or remove entities or change what they track need a reload;
+# every other option is applied to the running water heater.
+_RELOAD_OPTIONS = frozenset(
+    {
+        CONF_NAME,
+        CONF_HEATER,
+        CONF_SENSOR,
+        CONF_ECO_TEMPLATE,
+        CONF_ECO_CONDITIONS,
+        CONF_ECO_PRICE_SENSOR,
+        CONF_ECO_PRICE_CHEAPEST_SLOTS,
+        CONF_ECO_PRICE_PERCENTILE,
+        CONF_ECO_SURPLUS_SENSOR,
+        CONF_ECO_SURPLUS_POWER,
+        CONF_ECO_SURPLUS_WINDOW_MINUTES,
+        CONF_ENABLE_MAX_TEMP_HISTORY_SENSOR,
+        CONF_MAX_TEMP_HISTORY_BUCKET_MINUTES,
+        CONF_ENABLE_TEMPERATURE_STATISTICS_SENSORS,
+    }
+)
+
 LEGACY_CONF_ECO_ENTITY = "eco_entity"
 LEGACY_CONF_ECO_VALUE = "eco_value"
 
 
-def smart_eco_signal(entry_id: str) -> str:
-    """Return dispatcher signal name for Smart Eco updates."""
-    return f"{DOMAIN}_smart_eco_{entry_id}"
-
-
-def smart_eco_state_signal(entry_id: str) -> str:
-    """Return dispatcher signal name for Smart Eco state updates."""
-    return f"{DOMAIN}_smart_eco_state_{entry_id}"
+def temperature_statistics_signal(entry_id: str) -> str:
+    """Return dispatcher signal name for temperature statistics updates."""
+    return f"{DOMAIN}_temperature_statistics_{entry_id}"
 
 
 async def async_setup(hass, hass_config):
@@ -53,13 +88,29 @@ async def async_setup(hass, hass_config):
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Generic Water Heater from a config entry."""
-    hass.data.setdefault(DOMAIN, {})
-    runtime = hass.data[DOMAIN].setdefault(entry.entry_id, {})
-    runtime.setdefault("smart_eco_mode", None)
-    runtime.setdefault("smart_eco_pause_reason", None)
-    runtime.setdefault("smart_eco_resume_at", None)
-    runtime.setdefault("smart_eco_last_heating_mode", None)
-    runtime.setdefault("smart_eco_state", "Off")
+    data = {**entry.data, **entry.options}
+    eco_conditions = _compile_eco_conditions(data)
+    eco_source = bool(
+        (data.get(CONF_ECO_TEMPLATE) or "").strip()
+        or eco_conditions is not None
+        or data.get(CONF_ECO_PRICE_SENSOR)
+        or data.get(CONF_ECO_SURPLUS_SENSOR)
+    )
+    # Smart Eco defaults to auto-resume policy when an eco source exists; otherwise Off.
+    runtime = GenericWaterHeaterRuntime(SMART_ECO_MODE_AUTO_RESUME if eco_source else SMART_ECO_MODE_OFF)
+    runtime.eco_conditions = eco_conditions
+    runtime.has_eco_source = eco_source
+    runtime.device_identifiers = _async_link_heater_device(hass, entry, data[CONF_HEATER])
+    runtime.config = data
+    entry.runtime_data = runtime
+
+    if data.get(CONF_ENABLE_TEMPERATURE_STATISTICS_SENSORS, False):
+        from .statistics import TemperatureStatistics
+
+        statistics = TemperatureStatistics(hass, entry.entry_id, data[CONF_SENSOR])
+        await statistics.async_start()
+        runtime.temperature_statistics = statistics
+        entry.async_on_unload(statistics.async_stop)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
@@ -67,17 +118,77 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+def _compile_eco_conditions(config: dict):
+    """Return the compiled eco conditions of a config, or None if unset or invalid."""
+    if not config.get(CONF_ECO_CONDITIONS):
+        return None
+
+    from .eco_conditions import EcoConditionError, compile_eco_conditions
+
+    try:
+        return compile_eco_conditions(config[CONF_ECO_CONDITIONS])
+    except EcoConditionError as err:
+        _LOGGER.error("%s: invalid eco conditions, they are ignored: %s", config.get(CONF_NAME), err)
+        return None
+
+
+def _async_link_heater_device(hass: HomeAssistant, entry: ConfigEntry, heater_entity_id: str):
+    """Return the heater switch device identifiers and drop stale device links."""
+    entity_entry = er.async_get(hass).async_get(heater_entity_id)
+    device_registry = dr.async_get(hass)
+    device_identifiers = None
+    current_device_id = None
+
+    if entity_entry and entity_entry.device_id:
+        device_entry = device_registry.async_get(entity_entry.device_id)
+        if device_entry:
+            device_identifiers = device_entry.identifiers
+            current_device_id = device_entry.id
+
+    # Cleanup old device links for this config entry
+    linked_devices = dr.async_entries_for_config_entry(device_registry, entry.entry_id)
+    for dev in linked_devices:
+        if current_device_id and dev.id != current_device_id:
+            device_registry.async_update_device(dev.id, remove_config_entry_id=entry.entry_id)
+        elif not current_device_id:
+            # If no physical device is linked, ensure we don't keep links to old physical devices.
+            # Check if it's the standalone device (identifier matches entry_id)
+            is_standalone = any(dom == DOMAIN and ident == entry.entry_id for dom, ident in dev.identifiers)
+            if not is_standalone:
+                device_registry.async_update_device(dev.id, remove_config_entry_id=entry.entry_id)
+
+    return device_identifiers
+
+
 async def _async_entry_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Handle options update by reloading the config entry."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Apply changed options live, reloading only when the entities change."""
+    runtime = entry.runtime_data
+    data = {**entry.data, **entry.options}
+    previous = runtime.config
+    changed = {key for key in data.keys() | previous.keys() if data.get(key) != previous.get(key)}
+    if not changed:
+        return
+
+    water_heater = runtime.water_heater_entity
+    if water_heater is None or not changed.isdisjoint(_RELOAD_OPTIONS):
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    _LOGGER.debug("Applying options %s to %s without reload", sorted(changed), entry.title)
+    runtime.config = data
+    await water_heater.async_apply_options(data)
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
-    if unload_ok:
-        hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
-    return unload_ok
+    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove stored data of a deleted config entry."""
+    from .statistics import async_remove_statistics
+
+    await async_remove_statistics(hass, entry.entry_id)
 
 
 async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -9,21 +9,41 @@ from homeassistant.helpers.selector import selector
 from . import (
     CONF_COLD_TOLERANCE,
     CONF_DEBUG_LOGGING,
+    CONF_ECO_CONDITIONS,
+    CONF_ECO_PRICE_CHEAPEST_SLOTS,
+    CONF_ECO_PRICE_PERCENTILE,
+    CONF_ECO_PRICE_SENSOR,
+    CONF_ECO_SURPLUS_POWER,
+    CONF_ECO_SURPLUS_SENSOR,
+    CONF_ECO_SURPLUS_WINDOW_MINUTES,
     CONF_ECO_TEMPLATE,
+    CONF_ELEMENT_POWER_KW,
     CONF_ENABLE_MAX_TEMP_HISTORY_SENSOR,
+    CONF_ENABLE_TEMPERATURE_STATISTICS_SENSORS,
     CONF_HEATER,
         CONF_SMART_ECO_MANUAL_OFF_RESUME_HOURS,
+    CONF_SMART_ECO_COUNTDOWN_STATE,
     CONF_HOT_TOLERANCE,
+    CONF_MAX_TEMP_HISTORY_BUCKET_MINUTES,
     CONF_MIN_OFF_DURATION,
     CONF_MIN_ON_DURATION,
+    CONF_SCHEDULE,
     CONF_SENSOR,
+    CONF_SITE_MAX_HEATERS_ON,
+    CONF_SITE_MAX_POWER_KW,
+    CONF_SITE_TURN_ON_MAX_DELAY,
+    CONF_SITE_TURN_ON_STAGGER,
+    CONF_SWITCH_CONFIRM_TIMEOUT,
     CONF_TEMP_MAX,
     CONF_TEMP_MIN,
     CONF_TEMP_STEP,
+    CONF_TURN_ON_PRIORITY,
     DOMAIN,
     LEGACY_CONF_ECO_ENTITY,
     LEGACY_CONF_ECO_VALUE,
 )
+from .eco_conditions import EcoConditionError, compile_eco_conditions
+from .schedule import ScheduleError, compile_schedule
 
 
 def _eco_template_default(config: dict) -> str:
@@ -41,6 +61,40 @@ def _eco_template_default(config: dict) -> str:
     return "{{ states(%r) == %r }}" % (eco_entity, str(eco_value))
 
 
+def _validate_eco_source(user_input: dict) -> dict[str, str]:
+    """Return form errors for the Smart Eco source, if any."""
+    sources = [
+        key
+        for key in (CONF_ECO_TEMPLATE, CONF_ECO_CONDITIONS, CONF_ECO_PRICE_SENSOR, CONF_ECO_SURPLUS_SENSOR)
+        if user_input.get(key)
+    ]
+    if len(sources) > 1:
+        return {sources[-1]: "eco_source_conflict"}
+    if not (conditions := user_input.get(CONF_ECO_CONDITIONS)):
+        return {}
+    try:
+        compile_eco_conditions(conditions)
+    except EcoConditionError:
+        return {CONF_ECO_CONDITIONS: "invalid_eco_conditions"}
+    return {}
+
+
+def _validate_schedule(user_input: dict) -> dict[str, str]:
+    """Return form errors for the weekly schedule, if any."""
+    if not (schedule := user_input.get(CONF_SCHEDULE)):
+        return {}
+    try:
+        compile_schedule(schedule)
+    except ScheduleError:
+        return {CONF_SCHEDULE: "invalid_schedule"}
+    return {}
+
+
+def _validate_input(user_input: dict) -> dict[str, str]:
+    """Return form errors for options that are compiled at setup."""
+    return {**_validate_eco_source(user_input), **_validate_schedule(user_input)}
+
+
 def _build_data_schema(current: dict | None = None) -> vol.Schema:
     """Build the config form schema."""
     current = current or {}
@@ -63,14 +117,78 @@ def _build_data_schema(current: dict | None = None) -> vol.Schema:
                 CONF_MIN_OFF_DURATION,
                 default=current.get(CONF_MIN_OFF_DURATION, current.get("min_cycle_duration", {"seconds": 120})),
             ): selector({"duration": {}}),
+            vol.Optional(
+                CONF_SWITCH_CONFIRM_TIMEOUT,
+                default=current.get(CONF_SWITCH_CONFIRM_TIMEOUT, 10),
+            ): selector({"number": {"min": 1, "max": 120, "step": 1, "mode": "box", "unit_of_measurement": "s"}}),
+            vol.Optional(
+                CONF_SCHEDULE,
+                description={"suggested_value": current.get(CONF_SCHEDULE)},
+            ): selector({"object": {}}),
+            vol.Optional(
+                CONF_ELEMENT_POWER_KW,
+                default=current.get(CONF_ELEMENT_POWER_KW, 0),
+            ): selector({"number": {"min": 0, "max": 50, "step": 0.1, "mode": "box", "unit_of_measurement": "kW"}}),
+            vol.Optional(
+                CONF_TURN_ON_PRIORITY,
+                default=current.get(CONF_TURN_ON_PRIORITY, 5),
+            ): selector({"number": {"min": 1, "max": 10, "step": 1, "mode": "slider"}}),
+            vol.Optional(
+                CONF_SITE_MAX_HEATERS_ON,
+                default=current.get(CONF_SITE_MAX_HEATERS_ON, 0),
+            ): selector({"number": {"min": 0, "max": 100, "step": 1, "mode": "box"}}),
+            vol.Optional(
+                CONF_SITE_MAX_POWER_KW,
+                default=current.get(CONF_SITE_MAX_POWER_KW, 0),
+            ): selector({"number": {"min": 0, "max": 1000, "step": 0.1, "mode": "box", "unit_of_measurement": "kW"}}),
+            vol.Optional(
+                CONF_SITE_TURN_ON_STAGGER,
+                default=current.get(CONF_SITE_TURN_ON_STAGGER, 0),
+            ): selector({"number": {"min": 0, "max": 60, "step": 0.5, "mode": "box", "unit_of_measurement": "s"}}),
+            vol.Optional(
+                CONF_SITE_TURN_ON_MAX_DELAY,
+                default=current.get(CONF_SITE_TURN_ON_MAX_DELAY, 60),
+            ): selector({"number": {"min": 1, "max": 600, "step": 1, "mode": "box", "unit_of_measurement": "s"}}),
             vol.Optional(
                 CONF_ECO_TEMPLATE,
                 description={"suggested_value": _eco_template_default(current)},
             ): selector({"template": {}}),
+            vol.Optional(
+                CONF_ECO_CONDITIONS,
+                description={"suggested_value": current.get(CONF_ECO_CONDITIONS)},
+            ): selector({"object": {}}),
+            vol.Optional(
+                CONF_ECO_PRICE_SENSOR,
+                description={"suggested_value": current.get(CONF_ECO_PRICE_SENSOR)},
+            ): selector({"entity": {"domain": "sensor"}}),
+            vol.Optional(
+                CONF_ECO_PRICE_CHEAPEST_SLOTS,
+                default=current.get(CONF_ECO_PRICE_CHEAPEST_SLOTS, 0),
+            ): selector({"number": {"min": 0, "max": 96, "step": 1, "mode": "box"}}),
+            vol.Optional(
+                CONF_ECO_PRICE_PERCENTILE,
+                default=current.get(CONF_ECO_PRICE_PERCENTILE, 25),
+            ): selector({"number": {"min": 0, "max": 100, "step": 1, "mode": "slider", "unit_of_measurement": "%"}}),
+            vol.Optional(
+                CONF_ECO_SURPLUS_SENSOR,
+                description={"suggested_value": current.get(CONF_ECO_SURPLUS_SENSOR)},
+            ): selector({"entity": {"domain": "sensor", "device_class": "power"}}),
+            vol.Optional(
+                CONF_ECO_SURPLUS_POWER,
+                default=current.get(CONF_ECO_SURPLUS_POWER, 1000),
+            ): selector({"number": {"min": 100, "max": 50000, "step": 100, "mode": "box", "unit_of_measurement": "W"}}),
+            vol.Optional(
+                CONF_ECO_SURPLUS_WINDOW_MINUTES,
+                default=current.get(CONF_ECO_SURPLUS_WINDOW_MINUTES, 10),
+            ): selector({"number": {"min": 1, "max": 60, "step": 1, "mode": "box", "unit_of_measurement": "min"}}),
             vol.Optional(
                 CONF_SMART_ECO_MANUAL_OFF_RESUME_HOURS,
                 default=current.get(CONF_SMART_ECO_MANUAL_OFF_RESUME_HOURS, 6),
             ): selector({"number": {"min": 1, "max": 48, "step": 1, "mode": "slider"}}),
+            vol.Optional(
+                CONF_SMART_ECO_COUNTDOWN_STATE,
+                default=current.get(CONF_SMART_ECO_COUNTDOWN_STATE, False),
+            ): selector({"boolean": {}}),
             vol.Optional(
                 CONF_DEBUG_LOGGING,
                 default=current.get(CONF_DEBUG_LOGGING, False),
@@ -79,6 +197,14 @@ def _build_data_schema(current: dict | None = None) -> vol.Schema:
                 CONF_ENABLE_MAX_TEMP_HISTORY_SENSOR,
                 default=current.get(CONF_ENABLE_MAX_TEMP_HISTORY_SENSOR, False),
             ): selector({"boolean": {}}),
+            vol.Optional(
+                CONF_MAX_TEMP_HISTORY_BUCKET_MINUTES,
+                default=current.get(CONF_MAX_TEMP_HISTORY_BUCKET_MINUTES, 0),
+            ): selector({"number": {"min": 0, "max": 60, "step": 1, "mode": "box", "unit_of_measurement": "min"}}),
+            vol.Optional(
+                CONF_ENABLE_TEMPERATURE_STATISTICS_SENSORS,
+                default=current.get(CONF_ENABLE_TEMPERATURE_STATISTICS_SENSORS, False),
+            ): selector({"boolean": {}}),
         }
     )
 
@@ -97,13 +223,13 @@ class GenericWaterHeaterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle the initial step."""
         errors = {}
 
-        if user_input is not None:
+        if user_input is not None and not (errors := _validate_input(user_input)):
             user_input.setdefault(CONF_ECO_TEMPLATE, "")
             user_input.setdefault(CONF_SMART_ECO_MANUAL_OFF_RESUME_HOURS, 6)
             user_input.setdefault(CONF_DEBUG_LOGGING, False)
             return self.async_create_entry(title=user_input[CONF_NAME], data=user_input)
 
-        return self.async_show_form(step_id="user", data_schema=_build_data_schema(), errors=errors)
+        return self.async_show_form(step_id="user", data_schema=_build_data_schema(user_input), errors=errors)
 
 
 class OptionsFlowHandler(config_entries.OptionsFlow):
@@ -111,14 +237,20 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
 
     async def async_step_init(self, user_input=None):
         """Manage the integration options."""
-        if user_input is not None:
-            # Explicitly persist CONF_ECO_TEMPLATE as "" when cleared so it
-            # overrides any value in entry.data when both are merged later.
+        errors = {}
+
+        if user_input is not None and not (errors := _validate_input(user_input)):
+            # Explicitly persist cleared values ("" and []) so they override
+            # entry.data when both are merged.
             user_input.setdefault(CONF_ECO_TEMPLATE, "")
+            user_input.setdefault(CONF_ECO_CONDITIONS, [])
+            user_input.setdefault(CONF_ECO_PRICE_SENSOR, "")
+            user_input.setdefault(CONF_ECO_SURPLUS_SENSOR, "")
+            user_input.setdefault(CONF_SCHEDULE, [])
             user_input.setdefault(CONF_SMART_ECO_MANUAL_OFF_RESUME_HOURS, 6)
             user_input.setdefault(CONF_DEBUG_LOGGING, False)
             return self.async_create_entry(title="", data=user_input)
 
-        current = {**self.config_entry.data, **self.config_entry.options}
+        current = user_input or {**self.config_entry.data, **self.config_entry.options}
 
-        return self.async_show_form(step_id="init", data_schema=_build_data_schema(current))
+        return self.async_show_form(step_id="init", data_schema=_build_data_schema(current), errors=errors)
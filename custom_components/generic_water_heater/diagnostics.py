@@ -0,0 +1,31 @@
+"""Diagnostics support for Generic Water Heater."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .eco_template import async_get_eco_template_evaluator
+from .power_budget import async_get_power_budget
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    runtime = entry.runtime_data
+    water_heater = runtime.water_heater_entity
+
+    return {
+        "config": {**entry.data, **entry.options},
+        "smart_eco": {
+            "mode": runtime.smart_eco_mode,
+            "pause_reason": runtime.smart_eco_pause_reason,
+            "resume_at": runtime.smart_eco_resume_at,
+            "state": runtime.smart_eco_state,
+        },
+        "water_heater": water_heater.diagnostics if water_heater is not None else None,
+        "eco_templates": async_get_eco_template_evaluator(hass).diagnostics,
+        "power_budget": async_get_power_budget(hass).diagnostics,
+    }
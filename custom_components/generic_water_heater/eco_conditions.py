@@ -0,0 +1,310 @@
+"""Structured Smart Eco conditions evaluated without Jinja.
+
+Conditions are a list of predicates that must all hold, for example::
+
+    - entity_id: sensor.tariff
+      state: [low, very_low]
+    - entity_id: sensor.pv_power
+      above: 3000
+    - after: "22:00"
+      before: "06:00"
+      weekdays: [mon, tue, wed, thu, fri]
+
+Each predicate compiles to a plain Python closure. The tracker listens only to
+the referenced entities and arms a single timer for the next time boundary.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from typing import Any
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HassJob,
+    HomeAssistant,
+    callback,
+)
+from homeassistant.helpers.event import (
+    async_track_point_in_utc_time,
+    async_track_state_change_event,
+)
+import homeassistant.util.dt as dt_util
+
+from . import DOMAIN
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+_ENTITY_KEYS = frozenset({"entity_id", "attribute", "state", "above", "below"})
+_TIME_KEYS = frozenset({"after", "before", "weekdays"})
+
+Predicate = Callable[[HomeAssistant, datetime], bool]
+
+
+class EcoConditionError(ValueError):
+    """Raised when structured eco conditions are invalid."""
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledEcoConditions:
+    """Predicates, the entities they read and the times of day they change at."""
+
+    predicates: tuple[Predicate, ...]
+    entity_ids: frozenset[str]
+    boundaries: tuple[time, ...]
+    uses_weekdays: bool
+
+    def evaluate(self, hass: HomeAssistant, now: datetime) -> bool:
+        """Return whether every predicate holds."""
+        return all(predicate(hass, now) for predicate in self.predicates)
+
+    def next_boundary(self, now: datetime) -> datetime | None:
+        """Return the next moment a time predicate can change its result."""
+        if not self.boundaries and not self.uses_weekdays:
+            return None
+
+        local_now = dt_util.as_local(now)
+        tzinfo = local_now.tzinfo
+        today = local_now.date()
+        tomorrow = today + timedelta(days=1)
+        candidates = [
+            datetime.combine(day, boundary, tzinfo=tzinfo)
+            for day in (today, tomorrow)
+            for boundary in self.boundaries
+        ]
+        if self.uses_weekdays:
+            candidates.append(datetime.combine(tomorrow, time(0), tzinfo=tzinfo))
+        return min(candidate for candidate in candidates if candidate > local_now)
+
+
+def compile_eco_conditions(config: Any) -> CompiledEcoConditions:
+    """Compile structured eco conditions, raising EcoConditionError if invalid."""
+    if isinstance(config, dict):
+        config = [config]
+    if not isinstance(config, list) or not config:
+        raise EcoConditionError("expected a non-empty list of conditions")
+
+    predicates: list[Predicate] = []
+    entity_ids: set[str] = set()
+    boundaries: set[time] = set()
+    uses_weekdays = False
+
+    for item in config:
+        if not isinstance(item, dict):
+            raise EcoConditionError(f"condition must be a mapping: {item!r}")
+
+        keys = set(item)
+        if "entity_id" in keys:
+            if unknown := keys - _ENTITY_KEYS:
+                raise EcoConditionError(f"unknown keys {sorted(unknown)} in entity condition")
+            entity_id = item["entity_id"]
+            if not isinstance(entity_id, str) or "." not in entity_id:
+                raise EcoConditionError(f"invalid entity_id: {entity_id!r}")
+            attribute = item.get("attribute")
+            if "state" in keys:
+                if keys & {"above", "below"}:
+                    raise EcoConditionError("use either state or above/below in one condition")
+                predicates.append(_state_predicate(entity_id, attribute, item["state"]))
+            elif keys & {"above", "below"}:
+                predicates.append(
+                    _numeric_predicate(
+                        entity_id,
+                        attribute,
+                        _as_float(item.get("above")),
+                        _as_float(item.get("below")),
+                    )
+                )
+            else:
+                raise EcoConditionError(f"condition for {entity_id} needs state, above or below")
+            entity_ids.add(entity_id)
+            continue
+
+        if not keys or keys - _TIME_KEYS:
+            raise EcoConditionError(f"unknown condition: {item!r}")
+        after = _as_time(item.get("after"))
+        before = _as_time(item.get("before"))
+        weekdays = _as_weekdays(item.get("weekdays"))
+        predicates.append(_time_predicate(after, before, weekdays))
+        boundaries.update(boundary for boundary in (after, before) if boundary is not None)
+        uses_weekdays = uses_weekdays or weekdays is not None
+
+    return CompiledEcoConditions(
+        predicates=tuple(predicates),
+        entity_ids=frozenset(entity_ids),
+        boundaries=tuple(sorted(boundaries)),
+        uses_weekdays=uses_weekdays,
+    )
+
+
+def _source_value(hass: HomeAssistant, entity_id: str, attribute: str | None) -> Any:
+    """Return the entity state or attribute, or None when unavailable."""
+    if (state := hass.states.get(entity_id)) is None:
+        return None
+    if attribute is not None:
+        return state.attributes.get(attribute)
+    if state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+        return None
+    return state.state
+
+
+def _state_predicate(entity_id: str, attribute: str | None, expected: Any) -> Predicate:
+    """Return a predicate matching the state against one or more values."""
+    values = expected if isinstance(expected, list) else [expected]
+    if not values:
+        raise EcoConditionError(f"empty state list for {entity_id}")
+    accepted = frozenset(str(value) for value in values)
+
+    def predicate(hass: HomeAssistant, _now: datetime) -> bool:
+        value = _source_value(hass, entity_id, attribute)
+        return value is not None and str(value) in accepted
+
+    return predicate
+
+
+def _numeric_predicate(
+    entity_id: str,
+    attribute: str | None,
+    above: float | None,
+    below: float | None,
+) -> Predicate:
+    """Return a predicate checking a numeric value against above/below bounds."""
+
+    def predicate(hass: HomeAssistant, _now: datetime) -> bool:
+        try:
+            value = float(_source_value(hass, entity_id, attribute))
+        except (TypeError, ValueError):
+            return False
+        if above is not None and not value > above:
+            return False
+        return below is None or value < below
+
+    return predicate
+
+
+def _time_predicate(after: time | None, before: time | None, weekdays: frozenset[int] | None) -> Predicate:
+    """Return a predicate for a local time-of-day window on selected weekdays."""
+    start = after or time(0)
+
+    def predicate(_hass: HomeAssistant, now: datetime) -> bool:
+        local_now = dt_util.as_local(now)
+        if weekdays is not None and local_now.weekday() not in weekdays:
+            return False
+        current = local_now.time()
+        if before is None:
+            return current >= start
+        if start <= before:
+            return start <= current < before
+        # The window wraps past midnight.
+        return current >= start or current < before
+
+    return predicate
+
+
+def _as_float(value: Any) -> float | None:
+    """Return a numeric bound."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError) as err:
+        raise EcoConditionError(f"invalid number: {value!r}") from err
+
+
+def _as_time(value: Any) -> time | None:
+    """Return a time of day from an HH:MM[:SS] string."""
+    if value is None:
+        return None
+    if isinstance(value, str) and (parsed := dt_util.parse_time(value)) is not None:
+        return parsed
+    raise EcoConditionError(f"invalid time: {value!r}")
+
+
+def _as_weekdays(value: Any) -> frozenset[int] | None:
+    """Return weekday indexes (Monday is 0)."""
+    if value is None:
+        return None
+    values = value if isinstance(value, list) else [value]
+    try:
+        weekdays = frozenset(WEEKDAYS.index(str(day).lower()[:3]) for day in values)
+    except ValueError as err:
+        raise EcoConditionError(f"invalid weekdays: {value!r}") from err
+    if not weekdays:
+        raise EcoConditionError("empty weekday list")
+    return weekdays
+
+
+class EcoConditionTracker:
+    """Keep the result of compiled conditions current and report changes."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        conditions: CompiledEcoConditions,
+        action: Callable[[bool, Event[EventStateChangedData] | None], Coroutine[Any, Any, None] | None],
+    ) -> None:
+        """Initialize the tracker."""
+        self.hass = hass
+        self._conditions = conditions
+        self._job = HassJob(action, f"{DOMAIN} eco condition listener")
+        self._unsub_state: CALLBACK_TYPE | None = None
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self.result = False
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Evaluate once and start tracking; return a callback that stops it."""
+        if self._conditions.entity_ids:
+            self._unsub_state = async_track_state_change_event(
+                self.hass,
+                self._conditions.entity_ids,
+                self._async_state_changed,
+            )
+        now = dt_util.utcnow()
+        self.result = self._conditions.evaluate(self.hass, now)
+        self._async_arm_timer(now)
+        return self.async_stop
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop tracking entities and time boundaries."""
+        if self._unsub_state is not None:
+            self._unsub_state()
+            self._unsub_state = None
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    @callback
+    def _async_arm_timer(self, now: datetime) -> None:
+        """Arm the timer for the next time boundary, if any."""
+        if (boundary := self._conditions.next_boundary(now)) is not None:
+            self._unsub_timer = async_track_point_in_utc_time(
+                self.hass,
+                self._async_boundary_reached,
+                dt_util.as_utc(boundary),
+            )
+
+    @callback
+    def _async_boundary_reached(self, now: datetime) -> None:
+        """Re-evaluate at a time boundary and arm the next one."""
+        self._unsub_timer = None
+        self._async_arm_timer(now)
+        self._async_evaluate(None)
+
+    @callback
+    def _async_state_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Re-evaluate when a referenced entity changes."""
+        self._async_evaluate(event)
+
+    @callback
+    def _async_evaluate(self, event: Event[EventStateChangedData] | None) -> None:
+        """Report the result when it changes."""
+        result = self._conditions.evaluate(self.hass, dt_util.utcnow())
+        if result == self.result:
+            return
+        self.result = result
+        self.hass.async_run_hass_job(self._job, result, event)
@@ -0,0 +1,122 @@
+"""Shared evaluation of Smart Eco template conditions."""
+from __future__ import annotations
+
+from collections.abc import Callable, Coroutine
+from functools import partial
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, Event, HassJob, HomeAssistant, callback
+from homeassistant.exceptions import TemplateError
+from homeassistant.helpers.event import (
+    TrackTemplate,
+    TrackTemplateResult,
+    TrackTemplateResultInfo,
+    async_track_template_result,
+)
+from homeassistant.helpers.template import Template, result_as_boolean
+
+from . import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+_DATA_EVALUATOR = f"{DOMAIN}_eco_template_evaluator"
+
+# Called with the boolean result (or the render error) and the triggering event.
+EcoTemplateListener = Callable[[bool | TemplateError, Event | None], Coroutine[Any, Any, None] | None]
+
+
+@callback
+def async_get_eco_template_evaluator(hass: HomeAssistant) -> EcoTemplateEvaluator:
+    """Return the evaluator shared by every config entry."""
+    if (evaluator := hass.data.get(_DATA_EVALUATOR)) is None:
+        evaluator = hass.data[_DATA_EVALUATOR] = EcoTemplateEvaluator(hass)
+    return evaluator
+
+
+class _TrackedTemplate:
+    """One distinct template string, its tracker and its subscribers."""
+
+    __slots__ = ("template", "info", "result", "jobs")
+
+    def __init__(self, template: Template) -> None:
+        """Initialize an untracked template."""
+        self.template = template
+        self.info: TrackTemplateResultInfo | None = None
+        self.result: bool | TemplateError | None = None
+        self.jobs: list[HassJob] = []
+
+
+class EcoTemplateEvaluator:
+    """Render each distinct eco template once and fan the result out.
+
+    Entries with the same template string share one ``Template`` and one
+    template tracker, so a dependency change renders the template once no
+    matter how many water heaters use it. The tracker is removed with its last
+    subscriber.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the evaluator."""
+        self.hass = hass
+        self._tracked: dict[str, _TrackedTemplate] = {}
+
+    @callback
+    def async_subscribe(self, template_str: str, listener: EcoTemplateListener) -> CALLBACK_TYPE:
+        """Call listener whenever the result of template_str changes."""
+        tracked = self._tracked.get(template_str)
+        if tracked is None:
+            tracked = self._tracked[template_str] = _TrackedTemplate(Template(template_str, self.hass))
+            tracked.info = async_track_template_result(
+                self.hass,
+                [TrackTemplate(tracked.template, None)],
+                partial(self._async_template_changed, tracked),
+            )
+            # Renders synchronously, so the result is cached before anyone subscribes.
+            tracked.info.async_refresh()
+
+        job = HassJob(listener, f"{DOMAIN} eco template listener")
+        tracked.jobs.append(job)
+
+        @callback
+        def unsubscribe() -> None:
+            tracked.jobs.remove(job)
+            if not tracked.jobs:
+                tracked.info.async_remove()
+                del self._tracked[template_str]
+
+        return unsubscribe
+
+    def result(self, template_str: str) -> bool | TemplateError | None:
+        """Return the last result of a subscribed template."""
+        tracked = self._tracked.get(template_str)
+        return tracked.result if tracked is not None else None
+
+    @property
+    def diagnostics(self) -> dict[str, int]:
+        """Return the number of trackers and subscribers."""
+        return {
+            "templates": len(self._tracked),
+            "subscribers": sum(len(tracked.jobs) for tracked in self._tracked.values()),
+        }
+
+    @callback
+    def _async_template_changed(
+        self,
+        tracked: _TrackedTemplate,
+        event: Event | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        """Cache a new template result and pass it to every subscriber."""
+        result = updates[-1].result
+        if isinstance(result, TemplateError):
+            _LOGGER.warning("Eco template update failed: %s", result)
+        else:
+            result = result_as_boolean(result)
+            if result is tracked.result:
+                # The rendered text changed but the condition did not.
+                return
+        tracked.result = result
+
+        for job in list(tracked.jobs):
+            self.hass.async_run_hass_job(job, tracked.result, event)
@@ -0,0 +1,287 @@
+"""Site-wide power budget shared by every water heater of the integration.
+
+Heaters on one supply may be capped by how many of them are on at once and by
+the total element power. Each heater asks the budget before switching on; a
+request that does not fit waits in a priority queue ordered by configured
+priority and then by how far the heater is below its turn-on threshold. When a
+heater switches off, waiting heaters are admitted in that order.
+
+Admitted turn-ons can also be staggered: each one gets the next free slot a
+fixed spacing after the previous one, so heaters that all want heat in the
+same tick close their relays seconds apart. Slots stay within a maximum delay
+while the burst fits; beyond that, turn-ons follow a minimum gap apart and
+wait past the bound rather than switching on together.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Coroutine
+import heapq
+from typing import Any, NamedTuple
+
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+
+from . import (
+    CONF_ELEMENT_POWER_KW,
+    CONF_SITE_MAX_HEATERS_ON,
+    CONF_SITE_MAX_POWER_KW,
+    CONF_SITE_TURN_ON_MAX_DELAY,
+    CONF_SITE_TURN_ON_STAGGER,
+    CONF_TURN_ON_PRIORITY,
+    DOMAIN,
+)
+
+_DATA_POWER_BUDGET = f"{DOMAIN}_power_budget"
+# Smallest spacing kept between staggered turn-ons once the maximum delay is used up.
+_MIN_TURN_ON_GAP_S = 1.0
+
+
+class BudgetSettings(NamedTuple):
+    """Budget options of one heater; zero limits mean unlimited."""
+
+    priority: int
+    power_kw: float
+    max_heaters_on: int
+    max_power_kw: float
+    turn_on_stagger_s: float
+    max_turn_on_delay_s: float
+
+
+def budget_settings(config: dict[str, Any]) -> BudgetSettings:
+    """Return the budget options of a config entry."""
+    return BudgetSettings(
+        priority=int(config.get(CONF_TURN_ON_PRIORITY, 5) or 0),
+        power_kw=float(config.get(CONF_ELEMENT_POWER_KW, 0) or 0),
+        max_heaters_on=int(config.get(CONF_SITE_MAX_HEATERS_ON, 0) or 0),
+        max_power_kw=float(config.get(CONF_SITE_MAX_POWER_KW, 0) or 0),
+        turn_on_stagger_s=float(config.get(CONF_SITE_TURN_ON_STAGGER, 0) or 0),
+        max_turn_on_delay_s=float(config.get(CONF_SITE_TURN_ON_MAX_DELAY, 60) or 0),
+    )
+
+
+@callback
+def async_get_power_budget(hass: HomeAssistant) -> PowerBudget:
+    """Return the budget shared by every config entry."""
+    if (budget := hass.data.get(_DATA_POWER_BUDGET)) is None:
+        budget = hass.data[_DATA_POWER_BUDGET] = PowerBudget(hass)
+    return budget
+
+
+class _Member:
+    """Registration of one heater."""
+
+    __slots__ = ("settings", "job")
+
+    def __init__(self, settings: BudgetSettings, job: HassJob) -> None:
+        """Initialize a member."""
+        self.settings = settings
+        self.job = job
+
+
+class PowerBudget:
+    """Admit heater turn-ons within the site limits, best candidate first.
+
+    The limits are the strictest non-zero values set on any registered heater,
+    so the budget can be configured from any entry. Waiting requests sit in a
+    heap with lazy deletion: re-requesting with a new deficit pushes a fresh
+    entry and the old one is dropped when it surfaces.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty budget."""
+        self.hass = hass
+        self._members: dict[str, _Member] = {}
+        # Heaters that are on, or were admitted and are switching on.
+        self._active: set[str] = set()
+        self._active_power_kw = 0.0
+        # key -> sequence of its live heap entry
+        self._waiting: dict[str, int] = {}
+        self._heap: list[tuple[int, float, int, str]] = []
+        self._sequence = 0
+        self._max_heaters_on = 0
+        self._max_power_kw = 0.0
+        self._admitted_from_queue = 0
+        self._turn_on_stagger_s = 0.0
+        self._max_turn_on_delay_s = 0.0
+        # key -> loop time its turn-on may be sent at
+        self._turn_on_slots: dict[str, float] = {}
+        self._last_turn_on_slot = float("-inf")
+        self._staggered_turn_ons = 0
+
+    @callback
+    def async_register(
+        self,
+        key: str,
+        settings: BudgetSettings,
+        grant: Callable[[], Coroutine[Any, Any, None] | None],
+    ) -> CALLBACK_TYPE:
+        """Register a heater; grant is called when a waiting request is admitted."""
+        self._members[key] = _Member(settings, HassJob(grant, f"{DOMAIN} power budget grant"))
+        self._async_update_limits()
+
+        @callback
+        def unregister() -> None:
+            self.async_release(key)
+            del self._members[key]
+            self._async_update_limits()
+            self._async_admit()
+
+        return unregister
+
+    @callback
+    def async_update_settings(self, key: str, settings: BudgetSettings) -> None:
+        """Apply changed options of a registered heater."""
+        member = self._members[key]
+        if key in self._active:
+            self._active_power_kw += settings.power_kw - member.settings.power_kw
+        member.settings = settings
+        self._async_update_limits()
+        self._async_admit()
+
+    @callback
+    def async_request(self, key: str, deficit: float) -> bool:
+        """Return whether the heater may switch on now; otherwise queue it."""
+        if key in self._active:
+            return True
+        if not self._waiting and self._fits(key):
+            self._activate(key)
+            return True
+
+        self._sequence += 1
+        self._waiting[key] = self._sequence
+        settings = self._members[key].settings
+        heapq.heappush(self._heap, (-settings.priority, -deficit, self._sequence, key))
+        if len(self._heap) > 4 * len(self._waiting) + 16:
+            # Re-requests leave stale entries behind; rebuild from the live ones.
+            self._heap = [entry for entry in self._heap if self._waiting.get(entry[3]) == entry[2]]
+            heapq.heapify(self._heap)
+        # A better-ranked request may fit where the previous head did not.
+        self._async_admit()
+        return key in self._active
+
+    @callback
+    def async_turn_on_delay(self, key: str) -> float:
+        """Return how many seconds an admitted turn-on must wait for its slot.
+
+        The first call assigns the slot; later calls return the time left, and
+        zero once the slot is reached.
+        """
+        if not self._turn_on_stagger_s:
+            return 0.0
+
+        now = self.hass.loop.time()
+        if (slot := self._turn_on_slots.get(key)) is None:
+            slot = max(now, self._last_turn_on_slot + self._turn_on_stagger_s)
+            latest = now + self._max_turn_on_delay_s
+            if slot > latest:
+                # The burst does not fit the bound: keep a minimum gap and run past it.
+                gap = min(self._turn_on_stagger_s, _MIN_TURN_ON_GAP_S)
+                slot = max(latest, self._last_turn_on_slot + gap)
+            self._last_turn_on_slot = max(self._last_turn_on_slot, slot)
+            if slot <= now:
+                return 0.0
+            self._turn_on_slots[key] = slot
+            self._staggered_turn_ons += 1
+
+        if slot <= now:
+            del self._turn_on_slots[key]
+            return 0.0
+        return slot - now
+
+    @callback
+    def async_mark_on(self, key: str) -> None:
+        """Count a heater that was switched on outside the budget."""
+        self._waiting.pop(key, None)
+        if key not in self._active:
+            self._activate(key)
+
+    @callback
+    def async_release(self, key: str) -> None:
+        """Drop a heater's reservation and queued request, then admit waiters."""
+        self._waiting.pop(key, None)
+        self._turn_on_slots.pop(key, None)
+        if key in self._active:
+            self._active.discard(key)
+            self._active_power_kw -= self._members[key].settings.power_kw
+        # Dropping a queued head can unblock the requests behind it too.
+        self._async_admit()
+
+    def is_waiting(self, key: str) -> bool:
+        """Return whether a heater is queued for capacity."""
+        return key in self._waiting
+
+    @property
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the limits, the active heaters and the queue in admission order."""
+        queue = sorted(entry for entry in self._heap if self._waiting.get(entry[3]) == entry[2])
+        return {
+            "max_heaters_on": self._max_heaters_on,
+            "max_power_kw": self._max_power_kw,
+            "active": sorted(self._active),
+            "active_power_kw": round(self._active_power_kw, 3),
+            "waiting": [key for _priority, _deficit, _sequence, key in queue],
+            "admitted_from_queue": self._admitted_from_queue,
+            "turn_on_stagger_s": self._turn_on_stagger_s,
+            "max_turn_on_delay_s": self._max_turn_on_delay_s,
+            "staggered_turn_ons": self._staggered_turn_ons,
+            "pending_turn_on_slots": {
+                key: round(slot - self.hass.loop.time(), 1)
+                for key, slot in sorted(self._turn_on_slots.items(), key=lambda item: item[1])
+            },
+        }
+
+    def _fits(self, key: str) -> bool:
+        """Return whether switching the heater on stays within the limits."""
+        if not self._active:
+            # A heater rated above the power cap still runs on its own.
+            return True
+        if self._max_heaters_on and len(self._active) >= self._max_heaters_on:
+            return False
+        power_kw = self._members[key].settings.power_kw
+        return not self._max_power_kw or self._active_power_kw + power_kw <= self._max_power_kw
+
+    def _activate(self, key: str) -> None:
+        """Reserve capacity for a heater."""
+        self._active.add(key)
+        self._active_power_kw += self._members[key].settings.power_kw
+
+    @callback
+    def _async_update_limits(self) -> None:
+        """Use the strictest limits and the widest stagger set on any heater."""
+        self._max_heaters_on = min(
+            (member.settings.max_heaters_on for member in self._members.values() if member.settings.max_heaters_on),
+            default=0,
+        )
+        self._max_power_kw = min(
+            (member.settings.max_power_kw for member in self._members.values() if member.settings.max_power_kw),
+            default=0.0,
+        )
+        self._turn_on_stagger_s = max(
+            (member.settings.turn_on_stagger_s for member in self._members.values()),
+            default=0.0,
+        )
+        self._max_turn_on_delay_s = min(
+            (
+                member.settings.max_turn_on_delay_s
+                for member in self._members.values()
+                if member.settings.turn_on_stagger_s
+            ),
+            default=0.0,
+        )
+
+    @callback
+    def _async_admit(self) -> None:
+        """Admit waiting heaters in order while the head of the queue fits."""
+        heap = self._heap
+        while heap:
+            _priority, _deficit, sequence, key = heap[0]
+            if self._waiting.get(key) != sequence:
+                heapq.heappop(heap)
+                continue
+            if not self._fits(key):
+                # Strict order: smaller heaters do not jump a larger one that waits.
+                return
+            heapq.heappop(heap)
+            del self._waiting[key]
+            self._activate(key)
+            self._admitted_from_queue += 1
+            self.hass.async_run_hass_job(self._members[key].job)
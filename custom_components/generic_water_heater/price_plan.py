@@ -0,0 +1,286 @@
+"""Cheapest-slot planning of Smart Eco heating from a dynamic price forecast.
+
+The forecast is read from the attributes of a price sensor, in the layout of
+the Nord Pool integration: ``raw_today``/``raw_tomorrow`` lists of
+``{"start", "end", "value"}`` items, or plain ``today``/``tomorrow`` price
+arrays covering the local day in equal hourly or 15-minute slots.
+
+For each day the planner selects the cheapest N slots, or the slots priced at
+or below a percentile of that day, and merges them into heating windows. The
+selection runs once per forecast change; between changes the planner only
+follows window boundaries with a single timer.
+
+A missing or unavailable forecast keeps the last plan, so a short outage of
+the price sensor does not block heating. Once the time passes the end of the
+last known forecast, heating is allowed until a new forecast arrives.
+"""
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Callable, Coroutine, Mapping
+from datetime import datetime, timedelta
+import heapq
+from itertools import groupby
+import math
+from typing import Any, NamedTuple
+
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HassJob,
+    HomeAssistant,
+    callback,
+)
+from homeassistant.helpers.event import (
+    async_track_point_in_utc_time,
+    async_track_state_change_event,
+)
+import homeassistant.util.dt as dt_util
+
+from . import DOMAIN
+
+_FORECAST_ATTRIBUTES = ("raw_today", "raw_tomorrow", "today", "tomorrow")
+
+
+class PriceSlot(NamedTuple):
+    """One forecast slot."""
+
+    start: datetime
+    end: datetime
+    price: float
+
+
+def parse_price_forecast(attributes: Mapping[str, Any], now: datetime) -> list[PriceSlot]:
+    """Return the forecast slots of a price sensor in UTC, ordered by start."""
+    slots: list[PriceSlot] = []
+    if attributes.get("raw_today") or attributes.get("raw_tomorrow"):
+        for key in ("raw_today", "raw_tomorrow"):
+            for item in attributes.get(key) or ():
+                if not isinstance(item, Mapping):
+                    continue
+                start = _as_datetime(item.get("start"))
+                end = _as_datetime(item.get("end"))
+                price = _as_price(item.get("value", item.get("price")))
+                if start is not None and end is not None and price is not None:
+                    slots.append(PriceSlot(start, end, price))
+    else:
+        today = dt_util.as_local(now).date()
+        for offset, key in ((0, "today"), (1, "tomorrow")):
+            prices = attributes.get(key)
+            if not isinstance(prices, (list, tuple)) or not prices:
+                continue
+            day_start = dt_util.as_utc(dt_util.start_of_local_day(today + timedelta(days=offset)))
+            day_end = dt_util.as_utc(dt_util.start_of_local_day(today + timedelta(days=offset + 1)))
+            # Slots split the local day evenly, so DST days get 23 or 25 hourly slots.
+            slot_length = (day_end - day_start) / len(prices)
+            for index, value in enumerate(prices):
+                if (price := _as_price(value)) is not None:
+                    start = day_start + slot_length * index
+                    slots.append(PriceSlot(start, start + slot_length, price))
+
+    slots.sort()
+    return slots
+
+
+def plan_cheapest_windows(
+    slots: list[PriceSlot],
+    cheapest_slots: int,
+    percentile: float,
+) -> tuple[tuple[datetime, datetime], ...]:
+    """Select the cheapest slots of each local day and merge them into windows.
+
+    With ``cheapest_slots`` above zero the N cheapest slots of each day are
+    selected; otherwise every slot priced at or below the given percentile of
+    its day is.
+    """
+    selected: list[PriceSlot] = []
+    for _day, day_slots in groupby(slots, key=lambda slot: dt_util.as_local(slot.start).date()):
+        day_slots = list(day_slots)
+        if cheapest_slots > 0:
+            selected.extend(heapq.nsmallest(cheapest_slots, day_slots, key=lambda slot: slot.price))
+        else:
+            prices = sorted(slot.price for slot in day_slots)
+            # Nearest-rank percentile, so 0 still selects the cheapest slot.
+            threshold = prices[max(0, math.ceil(percentile / 100 * len(prices)) - 1)]
+            selected.extend(slot for slot in day_slots if slot.price <= threshold)
+
+    windows: list[tuple[datetime, datetime]] = []
+    for slot in sorted(selected):
+        if windows and windows[-1][1] >= slot.start:
+            windows[-1] = (windows[-1][0], max(windows[-1][1], slot.end))
+        else:
+            windows.append((slot.start, slot.end))
+    return tuple(windows)
+
+
+def _as_datetime(value: Any) -> datetime | None:
+    """Return a UTC datetime from a datetime or ISO string."""
+    if isinstance(value, str):
+        value = dt_util.parse_datetime(value)
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    return dt_util.as_utc(value)
+
+
+def _as_price(value: Any) -> float | None:
+    """Return a slot price, or None for missing values."""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        price = float(value)
+    except (TypeError, ValueError):
+        return None
+    return price if math.isfinite(price) else None
+
+
+class PricePlanner:
+    """Plan heating windows from a price sensor and report when one starts or ends.
+
+    The planner has the same ``async_start``/``result`` interface as the eco
+    condition tracker, so the water heater treats it as its eco source.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entity_id: str,
+        cheapest_slots: int,
+        percentile: float,
+        action: Callable[[bool, Event[EventStateChangedData] | None], Coroutine[Any, Any, None] | None],
+        plan_changed: Callable[[], None] | None = None,
+    ) -> None:
+        """Initialize the planner."""
+        self.hass = hass
+        self.entity_id = entity_id
+        self._cheapest_slots = int(cheapest_slots)
+        self._percentile = float(percentile)
+        self._job = HassJob(action, f"{DOMAIN} price plan listener")
+        self._plan_changed = plan_changed
+        self._unsub_state: CALLBACK_TYPE | None = None
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._forecast: tuple[Any, ...] | None = None
+        self._slots = 0
+        self._plans_computed = 0
+        self.windows: tuple[tuple[datetime, datetime], ...] = ()
+        # Window starts and ends interleaved, so an odd bisect index means "inside".
+        self._boundaries: list[datetime] = []
+        # End of the last forecast slot; past it (or without any plan) heating is allowed.
+        self._forecast_end: datetime | None = None
+        self.result = False
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Plan from the current forecast and start tracking; return a stop callback."""
+        self._unsub_state = async_track_state_change_event(
+            self.hass, [self.entity_id], self._async_price_changed
+        )
+        now = dt_util.utcnow()
+        self._async_update_plan(now)
+        self.result = self._in_window(now)
+        self._async_arm_timer(now)
+        return self.async_stop
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop tracking the price sensor and window boundaries."""
+        if self._unsub_state is not None:
+            self._unsub_state()
+            self._unsub_state = None
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    def next_window_start(self, now: datetime) -> datetime | None:
+        """Return the start of the first window that begins after now."""
+        starts = self._boundaries[::2]
+        index = bisect_right(starts, now)
+        return starts[index] if index < len(starts) else None
+
+    @property
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the forecast size and how often the plan was computed."""
+        return {
+            "price_sensor": self.entity_id,
+            "slots": self._slots,
+            "windows": len(self.windows),
+            "forecast_end": self._forecast_end.isoformat() if self._forecast_end is not None else None,
+            "plans_computed": self._plans_computed,
+        }
+
+    def _in_window(self, now: datetime) -> bool:
+        """Return whether now falls inside a planned window, or the plan has run out."""
+        if self._forecast_end is None or now >= self._forecast_end:
+            return True
+        return bisect_right(self._boundaries, now) % 2 == 1
+
+    @callback
+    def _async_update_plan(self, now: datetime) -> bool:
+        """Re-plan if the forecast attributes changed; return whether they did."""
+        state = self.hass.states.get(self.entity_id)
+        if state is None or state.state == STATE_UNAVAILABLE:
+            return False
+        forecast = tuple(state.attributes.get(key) for key in _FORECAST_ATTRIBUTES)
+        if forecast == self._forecast:
+            return False
+
+        slots = parse_price_forecast(state.attributes, now)
+        if not slots:
+            # An outage or API error leaves no forecast; keep the last plan.
+            return False
+        self._forecast = forecast
+        self._forecast_end = max(slot.end for slot in slots)
+        self._slots = len(slots)
+        self._plans_computed += 1
+        windows = plan_cheapest_windows(slots, self._cheapest_slots, self._percentile)
+        if windows != self.windows:
+            self.windows = windows
+            self._boundaries = [moment for window in windows for moment in window]
+            if self._plan_changed is not None:
+                self._plan_changed()
+        return True
+
+    @callback
+    def _async_arm_timer(self, now: datetime) -> None:
+        """Arm the timer for the next window start or end, or the forecast end."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        index = bisect_right(self._boundaries, now)
+        if index < len(self._boundaries):
+            boundary = self._boundaries[index]
+        elif self._forecast_end is not None and now < self._forecast_end:
+            boundary = self._forecast_end
+        else:
+            return
+        self._unsub_timer = async_track_point_in_utc_time(self.hass, self._async_boundary_reached, boundary)
+
+    @callback
+    def _async_boundary_reached(self, now: datetime) -> None:
+        """Report the window change and arm the next boundary."""
+        self._unsub_timer = None
+        self._async_arm_timer(now)
+        if self._plan_changed is not None:
+            # The next window moves on when one starts.
+            self._plan_changed()
+        self._async_evaluate(None, now)
+
+    @callback
+    def _async_price_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Re-plan when the forecast changes; current price updates are ignored."""
+        now = dt_util.utcnow()
+        if self._async_update_plan(now):
+            self._async_arm_timer(now)
+            self._async_evaluate(event, now)
+
+    @callback
+    def _async_evaluate(self, event: Event[EventStateChangedData] | None, now: datetime) -> None:
+        """Report the result when it changes."""
+        result = self._in_window(now)
+        if result == self.result:
+            return
+        self.result = result
+        self.hass.async_run_hass_job(self._job, result, event)
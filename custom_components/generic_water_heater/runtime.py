@@ -0,0 +1,98 @@
+"""Runtime state shared by the platforms of a config entry."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+RuntimeListener = Callable[[frozenset[str]], None]
+
+# Fields that listeners are told about when they change.
+_TRACKED_FIELDS = frozenset(
+    {
+        "smart_eco_mode",
+        "smart_eco_pause_reason",
+        "smart_eco_resume_at",
+        "smart_eco_last_heating_mode",
+        "smart_eco_state",
+        "smart_eco_next_window",
+    }
+)
+
+
+class GenericWaterHeaterRuntime:
+    """Smart Eco policy state and entity handles of one config entry.
+
+    The water heater owns the Smart Eco fields and changes them through
+    ``async_update``. Listeners are called once per update with the names of the
+    fields that actually changed, so the select and sensors only write state on
+    real transitions.
+    """
+
+    __slots__ = (
+        "smart_eco_mode",
+        "smart_eco_pause_reason",
+        "smart_eco_resume_at",
+        "smart_eco_last_heating_mode",
+        "smart_eco_state",
+        "smart_eco_next_window",
+        "config",
+        "eco_conditions",
+        "has_eco_source",
+        "device_identifiers",
+        "water_heater_entity",
+        "temperature_statistics",
+        "_listeners",
+    )
+
+    def __init__(self, smart_eco_mode: str) -> None:
+        """Initialize runtime state with the default Smart Eco mode."""
+        self.smart_eco_mode: str = smart_eco_mode
+        self.smart_eco_pause_reason: str | None = None
+        self.smart_eco_resume_at: str | None = None
+        self.smart_eco_last_heating_mode: str = "electric"
+        self.smart_eco_state: str = "Off"
+        # Start of the next planned cheap-price window, when a price sensor is used.
+        self.smart_eco_next_window: str | None = None
+        # Merged entry data and options the platforms were set up with.
+        self.config: dict[str, Any] = {}
+        # Eco conditions compiled once at setup; None when unset or invalid.
+        self.eco_conditions: Any = None
+        # Whether a valid eco source drives Smart Eco; gates the select and sensors.
+        self.has_eco_source: bool = False
+        # Identifiers of the heater switch device the entities attach to, if any.
+        self.device_identifiers: set[tuple[str, str]] | None = None
+        self.water_heater_entity: Any = None
+        self.temperature_statistics: Any = None
+        self._listeners: list[RuntimeListener] = []
+
+    @callback
+    def async_update(self, **changes: Any) -> frozenset[str]:
+        """Apply field changes, notify listeners and return the changed fields."""
+        changed = []
+        for field, value in changes.items():
+            if field not in _TRACKED_FIELDS:
+                raise AttributeError(f"{field} is not a tracked runtime field")
+            if getattr(self, field) != value:
+                setattr(self, field, value)
+                changed.append(field)
+
+        if not changed:
+            return frozenset()
+
+        changed_fields = frozenset(changed)
+        for listener in list(self._listeners):
+            listener(changed_fields)
+        return changed_fields
+
+    @callback
+    def async_add_listener(self, listener: RuntimeListener) -> CALLBACK_TYPE:
+        """Call listener with the changed field names after each update."""
+        self._listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(listener)
+
+        return remove_listener
@@ -0,0 +1,157 @@
+"""Weekly time-of-use schedule for target temperature and operation mode.
+
+A schedule is a list of blocks, each starting at a local time on some weekdays::
+
+    - at: "06:00"
+      weekdays: [mon, tue, wed, thu, fri]
+      temperature: 55
+      operation_mode: electric
+    - at: "22:00"
+      temperature: 45
+
+A block stays active until the next block starts, wrapping around the week.
+Blocks compile to a sorted table of week offsets, so the active block is a
+binary search and the next transition is the following table entry.
+"""
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from typing import Any, NamedTuple
+
+from homeassistant.components.water_heater import STATE_ELECTRIC, STATE_OFF, STATE_PERFORMANCE
+import homeassistant.util.dt as dt_util
+
+from .eco_conditions import WEEKDAYS
+
+OPERATION_MODES = (STATE_ELECTRIC, STATE_PERFORMANCE, STATE_OFF)
+
+_BLOCK_KEYS = frozenset({"at", "weekdays", "temperature", "operation_mode"})
+_DAY_SECONDS = 86400
+_WEEK_SECONDS = 7 * _DAY_SECONDS
+
+
+class ScheduleError(ValueError):
+    """Raised when a schedule is invalid."""
+
+
+class ScheduleBlock(NamedTuple):
+    """Settings applied when a block starts; None leaves the setting alone."""
+
+    temperature: float | None
+    operation_mode: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledSchedule:
+    """Block start offsets from Monday 00:00 local time and their settings."""
+
+    starts: tuple[int, ...]
+    blocks: tuple[ScheduleBlock, ...]
+
+    def active_block(self, now: datetime) -> ScheduleBlock:
+        """Return the block in effect at now."""
+        # Index -1 is the last block of the week, still active early on Monday.
+        return self.blocks[bisect_right(self.starts, _week_offset(now)) - 1]
+
+    def previous_transition(self, now: datetime) -> datetime:
+        """Return the start of the block in effect at now."""
+        local_now = dt_util.as_local(now)
+        offset = _week_offset(local_now)
+        start = self.starts[bisect_right(self.starts, offset) - 1]
+        days = (local_now.weekday() - start // _DAY_SECONDS) % 7
+        if days == 0 and start > offset:
+            # The block started on this weekday last week.
+            days = 7
+        return _local_datetime(local_now, -days, start % _DAY_SECONDS)
+
+    def next_transition(self, now: datetime) -> datetime:
+        """Return the start of the next block after now."""
+        local_now = dt_util.as_local(now)
+        offset = _week_offset(local_now)
+        index = bisect_right(self.starts, offset)
+        start = self.starts[index % len(self.starts)]
+        days = (start // _DAY_SECONDS - local_now.weekday()) % 7
+        if days == 0 and start <= offset:
+            # The only later transition is the same weekday next week.
+            days = 7
+        return _local_datetime(local_now, days, start % _DAY_SECONDS)
+
+
+def compile_schedule(config: Any) -> CompiledSchedule:
+    """Compile a weekly schedule, raising ScheduleError if it is invalid."""
+    if isinstance(config, dict):
+        config = [config]
+    if not isinstance(config, list) or not config:
+        raise ScheduleError("expected a non-empty list of schedule blocks")
+
+    transitions: dict[int, ScheduleBlock] = {}
+    for item in config:
+        if not isinstance(item, dict):
+            raise ScheduleError(f"schedule block must be a mapping: {item!r}")
+        if unknown := set(item) - _BLOCK_KEYS:
+            raise ScheduleError(f"unknown keys {sorted(unknown)} in schedule block")
+
+        at = item.get("at")
+        if not isinstance(at, str) or (start := dt_util.parse_time(at)) is None:
+            raise ScheduleError(f"invalid block start: {at!r}")
+        block = ScheduleBlock(_as_temperature(item.get("temperature")), _as_mode(item.get("operation_mode")))
+        if block == ScheduleBlock(None, None):
+            raise ScheduleError(f"block at {at} sets neither temperature nor operation_mode")
+
+        day_offset = start.hour * 3600 + start.minute * 60 + start.second
+        for weekday in _as_weekdays(item.get("weekdays")):
+            offset = weekday * _DAY_SECONDS + day_offset
+            if offset in transitions:
+                raise ScheduleError(f"two blocks start at {WEEKDAYS[weekday]} {at}")
+            transitions[offset] = block
+
+    starts = tuple(sorted(transitions))
+    return CompiledSchedule(starts=starts, blocks=tuple(transitions[start] for start in starts))
+
+
+def _local_datetime(local_now: datetime, days: int, seconds: int) -> datetime:
+    """Return the local time of day ``seconds`` on the date ``days`` from now."""
+    return datetime.combine(
+        local_now.date() + timedelta(days=days),
+        time(seconds // 3600, seconds % 3600 // 60, seconds % 60),
+        tzinfo=local_now.tzinfo,
+    )
+
+
+def _week_offset(now: datetime) -> int:
+    """Return whole seconds since Monday 00:00 local time."""
+    local_now = dt_util.as_local(now)
+    return local_now.weekday() * _DAY_SECONDS + local_now.hour * 3600 + local_now.minute * 60 + local_now.second
+
+
+def _as_temperature(value: Any) -> float | None:
+    """Return a block target temperature."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError) as err:
+        raise ScheduleError(f"invalid temperature: {value!r}") from err
+
+
+def _as_mode(value: Any) -> str | None:
+    """Return a block operation mode."""
+    if value is None or value in OPERATION_MODES:
+        return value
+    raise ScheduleError(f"invalid operation_mode: {value!r}")
+
+
+def _as_weekdays(value: Any) -> range | list[int]:
+    """Return weekday indexes (Monday is 0); every day when unset."""
+    if value is None:
+        return range(7)
+    values = value if isinstance(value, list) else [value]
+    try:
+        weekdays = sorted({WEEKDAYS.index(str(day).lower()[:3]) for day in values})
+    except ValueError as err:
+        raise ScheduleError(f"invalid weekdays: {value!r}") from err
+    if not weekdays:
+        raise ScheduleError("empty weekday list")
+    return weekdays
@@ -3,19 +3,15 @@ from __future__ import annotations
 
 from homeassistant.components.select import SelectEntity
 from homeassistant.const import CONF_NAME
-from homeassistant.helpers import device_registry as dr, entity_registry as er
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.core import callback
 from homeassistant.helpers.restore_state import RestoreEntity
 
 from . import (
-    CONF_ECO_TEMPLATE,
-    CONF_HEATER,
     DOMAIN,
     SMART_ECO_MODE_ALWAYS_ON,
     SMART_ECO_MODE_AUTO_RESUME,
     SMART_ECO_MODE_OFF,
     SMART_ECO_MODE_UNTIL_MANUAL,
-    smart_eco_signal,
 )
 
 _OPTION_TO_MODE = {
@@ -29,27 +25,13 @@ _MODE_TO_OPTION = {value: key for key, value in _OPTION_TO_MODE.items()}
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up Smart Eco select for a config entry."""
-    data = {**entry.data, **getattr(entry, "options", {})}
-    eco_template = (data.get(CONF_ECO_TEMPLATE) or "").strip() or None
-    if eco_template is None:
+    if not entry.runtime_data.has_eco_source:
         return
 
+    data = {**entry.data, **getattr(entry, "options", {})}
     name = data.get(CONF_NAME)
-    heater_entity_id = data.get(CONF_HEATER)
-
-    runtime = hass.data.setdefault(DOMAIN, {}).setdefault(entry.entry_id, {})
-    if runtime.get("smart_eco_mode") is None:
-        runtime["smart_eco_mode"] = SMART_ECO_MODE_AUTO_RESUME
 
-    registry = er.async_get(hass)
-    device_registry = dr.async_get(hass)
-    entity_entry = registry.async_get(heater_entity_id)
-    device_identifiers = None
-
-    if entity_entry and entity_entry.device_id:
-        device_entry = device_registry.async_get(entity_entry.device_id)
-        if device_entry:
-            device_identifiers = device_entry.identifiers
+    device_identifiers = entry.runtime_data.device_identifiers
 
     async_add_entities(
         [
@@ -57,7 +39,7 @@ async def async_setup_entry(hass, entry, async_add_entities):
                 hass=hass,
                 entry_id=entry.entry_id,
                 name=name,
-                runtime=runtime,
+                runtime=entry.runtime_data,
                 device_identifiers=device_identifiers,
             )
         ]
@@ -72,7 +54,7 @@ class GenericWaterHeaterSmartEcoSelect(SelectEntity, RestoreEntity):
     _attr_name = "Smart Eco Mode"
     _attr_options = list(_OPTION_TO_MODE.keys())
 
-    def __init__(self, hass, entry_id: str, name: str | None, runtime: dict, device_identifiers):
+    def __init__(self, hass, entry_id: str, name: str | None, runtime, device_identifiers):
         """Initialize Smart Eco select."""
         self.hass = hass
         self._entry_id = entry_id
@@ -87,8 +69,7 @@ class GenericWaterHeaterSmartEcoSelect(SelectEntity, RestoreEntity):
     @property
     def current_option(self) -> str:
         """Return the currently selected Smart Eco mode."""
-        mode = self._runtime.get("smart_eco_mode", SMART_ECO_MODE_OFF)
-        return _MODE_TO_OPTION.get(mode, "Off")
+        return _MODE_TO_OPTION.get(self._runtime.smart_eco_mode, "Off")
 
     @property
     def device_info(self):
@@ -104,30 +85,24 @@ class GenericWaterHeaterSmartEcoSelect(SelectEntity, RestoreEntity):
 
         if (old_state := await self.async_get_last_state()) is not None:
             if old_state.state in _OPTION_TO_MODE:
-                self._runtime["smart_eco_mode"] = _OPTION_TO_MODE[old_state.state]
-
-        self._runtime["smart_eco_select_entity"] = self
-        self.async_on_remove(lambda: self._runtime.pop("smart_eco_select_entity", None))
+                self._runtime.async_update(smart_eco_mode=_OPTION_TO_MODE[old_state.state])
 
-        self.async_on_remove(
-            async_dispatcher_connect(
-                self.hass,
-                smart_eco_signal(self._entry_id),
-                self._async_handle_smart_eco_signal,
-            )
-        )
+        self.async_on_remove(self._runtime.async_add_listener(self._async_handle_runtime_update))
 
     async def async_select_option(self, option: str) -> None:
         """Handle user selecting a Smart Eco mode."""
         mode = _OPTION_TO_MODE[option]
-        self._runtime["smart_eco_mode"] = mode
 
-        wh_entity = self._runtime.get("water_heater_entity")
+        wh_entity = self._runtime.water_heater_entity
         if wh_entity is not None and hasattr(wh_entity, "async_set_smart_eco_mode"):
             await wh_entity.async_set_smart_eco_mode(mode, source="smart_eco_select")
+        else:
+            self._runtime.async_update(smart_eco_mode=mode)
 
-        self.schedule_update_ha_state()
+        self.async_write_ha_state()
 
-    def _async_handle_smart_eco_signal(self, _payload) -> None:
-        """Handle dispatcher updates from the water heater entity."""
-        self.schedule_update_ha_state()
+    @callback
+    def _async_handle_runtime_update(self, changed: frozenset[str]) -> None:
+        """Write state when the Smart Eco mode changes."""
+        if "smart_eco_mode" in changed:
+            self.async_write_ha_state()
@@ -1,6 +1,7 @@
 """Sensor platform for Generic Water Heater."""
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import logging
@@ -10,41 +11,77 @@ from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
     SensorExtraStoredData,
+    SensorStateClass,
 )
 from homeassistant.const import CONF_NAME, STATE_UNAVAILABLE, STATE_UNKNOWN
 from homeassistant.core import Event, EventStateChangedData, callback
-from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.restore_state import RestoreEntity
 import homeassistant.util.dt as dt_util
 
 from . import (
+    CONF_ECO_PRICE_SENSOR,
     CONF_ENABLE_MAX_TEMP_HISTORY_SENSOR,
-    CONF_ECO_TEMPLATE,
-    CONF_HEATER,
+    CONF_ENABLE_TEMPERATURE_STATISTICS_SENSORS,
+    CONF_MAX_TEMP_HISTORY_BUCKET_MINUTES,
     CONF_SENSOR,
     DOMAIN,
-    smart_eco_state_signal,
+    temperature_statistics_signal,
 )
 
 _LOGGER = logging.getLogger(__name__)
 _WINDOW = timedelta(days=7)
 _ATTR_MAX_RECORDED_AT = "highest_recorded_at"
 _ATTR_SAMPLES_TRACKED = "samples_tracked"
+_ATTR_BUCKETS_TRACKED = "buckets_tracked"
+_HISTORY_STORAGE_VERSION = 2
+# One sample per minute over the window; larger histories are downsampled on save.
+_MAX_STORED_SAMPLES = 7 * 24 * 60
+_DOWNSAMPLE_SECONDS = 60
+_RESUME_FIELDS = frozenset({"smart_eco_pause_reason", "smart_eco_resume_at"})
 
 
 @dataclass
 class MaxTemperatureHistoryStoredData(SensorExtraStoredData):
-    """Stored data for the 7-day max temperature sensor."""
+    """Stored data for the 7-day max temperature sensor.
 
-    history: list[dict[str, Any]]
+    History is kept as ``(epoch_seconds, temperature, sample_count)`` entries and
+    serialized in a compact columnar form: whole-second timestamp deltas plus
+    parallel lists of temperatures and, when samples were merged into buckets,
+    sample counts. Version 1 data (a list of ISO timestamp dicts) is still read.
+    """
+
+    history: list[tuple[float, float, int]]
 
     def as_dict(self) -> dict[str, Any]:
         """Return a dict representation of the stored sensor data."""
+        history = self.history
+        if len(history) > _MAX_STORED_SAMPLES:
+            history = _downsample_history(history, _DOWNSAMPLE_SECONDS)
+
+        offsets: list[int] = []
+        temperatures: list[float] = []
+        counts: list[int] = []
+        previous = 0
+        for timestamp, temperature, count in history:
+            second = int(timestamp)
+            offsets.append(second - previous)
+            temperatures.append(temperature)
+            counts.append(count)
+            previous = second
+
+        encoded: dict[str, list] = {
+            "offsets": offsets,
+            "temperatures": temperatures,
+        }
+        if any(count != 1 for count in counts):
+            encoded["counts"] = counts
+
         return {
             **super().as_dict(),
-            "history": self.history,
+            "history_version": _HISTORY_STORAGE_VERSION,
+            "history": encoded,
         }
 
     @classmethod
@@ -55,69 +92,142 @@ class MaxTemperatureHistoryStoredData(SensorExtraStoredData):
             return None
 
         history = restored.get("history")
-        if not isinstance(history, list):
-            return None
+        if restored.get("history_version", 1) == 1:
+            cleaned_history = _migrate_history_v1(history)
+        else:
+            cleaned_history = _decode_history(history)
 
-        cleaned_history: list[dict[str, Any]] = []
-        for item in history:
-            if not isinstance(item, dict):
-                continue
-
-            timestamp = item.get("timestamp")
-            temperature = item.get("temperature")
-            if not isinstance(timestamp, str):
-                continue
-
-            parsed_timestamp = dt_util.parse_datetime(timestamp)
-            if parsed_timestamp is None:
-                continue
-
-            try:
-                cleaned_temperature = float(temperature)
-            except (TypeError, ValueError):
-                continue
-
-            cleaned_history.append(
-                {
-                    "timestamp": parsed_timestamp.isoformat(),
-                    "temperature": cleaned_temperature,
-                }
-            )
+        if cleaned_history is None:
+            return None
 
         return cls(extra.native_value, extra.native_unit_of_measurement, cleaned_history)
 
 
+def _decode_history(history: Any) -> list[tuple[float, float, int]] | None:
+    """Decode compact (version 2) history into epoch/temperature/count entries."""
+    if not isinstance(history, dict):
+        return None
+
+    offsets = history.get("offsets")
+    temperatures = history.get("temperatures")
+    if not isinstance(offsets, list) or not isinstance(temperatures, list):
+        return None
+    if len(offsets) != len(temperatures):
+        return None
+
+    counts = history.get("counts")
+    if not isinstance(counts, list) or len(counts) != len(offsets):
+        counts = [1] * len(offsets)
+
+    decoded: list[tuple[float, float, int]] = []
+    timestamp = 0
+    try:
+        for offset, temperature, count in zip(offsets, temperatures, counts):
+            timestamp += int(offset)
+            decoded.append((float(timestamp), float(temperature), max(1, int(count))))
+    except (TypeError, ValueError):
+        return None
+
+    return decoded
+
+
+def _migrate_history_v1(history: Any) -> list[tuple[float, float, int]] | None:
+    """Convert legacy list-of-dicts history into epoch/temperature/count entries."""
+    if not isinstance(history, list):
+        return None
+
+    migrated: list[tuple[float, float, int]] = []
+    for item in history:
+        if not isinstance(item, dict):
+            continue
+
+        timestamp = item.get("timestamp")
+        temperature = item.get("temperature")
+        if not isinstance(timestamp, str):
+            continue
+
+        parsed_timestamp = dt_util.parse_datetime(timestamp)
+        if parsed_timestamp is None:
+            continue
+
+        try:
+            cleaned_temperature = float(temperature)
+        except (TypeError, ValueError):
+            continue
+
+        migrated.append((parsed_timestamp.timestamp(), cleaned_temperature, 1))
+
+    return migrated
+
+
+def _downsample_history(
+    history: list[tuple[float, float, int]],
+    bucket_seconds: int,
+) -> list[tuple[float, float, int]]:
+    """Keep the earliest maximum sample of each time bucket.
+
+    The window maximum is exact at save time only. Once the window slides past
+    a kept sample, a dropped later sample of the same bucket might have been
+    the maximum, so the restored maximum can then read lower than the true one.
+    Sample counts are summed.
+    """
+    downsampled: list[tuple[float, float, int]] = []
+    current_bucket = None
+    for timestamp, temperature, count in history:
+        bucket = int(timestamp) // bucket_seconds
+        if bucket != current_bucket:
+            downsampled.append((timestamp, temperature, count))
+            current_bucket = bucket
+            continue
+
+        kept_timestamp, kept_temperature, kept_count = downsampled[-1]
+        if temperature > kept_temperature:
+            downsampled[-1] = (timestamp, temperature, kept_count + count)
+        else:
+            downsampled[-1] = (kept_timestamp, kept_temperature, kept_count + count)
+
+    return downsampled
+
+
 async def async_setup_entry(hass, entry, async_add_entities):
-    """Set up the 7-day max temperature sensor from a config entry."""
+    """Set up the sensors of a config entry."""
     data = {**entry.data, **getattr(entry, "options", {})}
-    eco_template = (data.get(CONF_ECO_TEMPLATE) or "").strip() or None
 
     entities = []
 
-    heater_entity_id = data.get(CONF_HEATER)
     source_sensor_entity_id = data.get(CONF_SENSOR)
     name = data.get(CONF_NAME)
 
-    registry = er.async_get(hass)
-    device_registry = dr.async_get(hass)
-    entity_entry = registry.async_get(heater_entity_id)
-    device_identifiers = None
+    device_identifiers = entry.runtime_data.device_identifiers
 
-    if entity_entry and entity_entry.device_id:
-        device_entry = device_registry.async_get(entity_entry.device_id)
-        if device_entry:
-            device_identifiers = device_entry.identifiers
-
-    if eco_template is not None:
+    if entry.runtime_data.has_eco_source:
+        runtime = entry.runtime_data
         entities.append(
             SmartEcoStateSensor(
                 hass=hass,
                 entry_id=entry.entry_id,
                 name=name,
-                runtime=hass.data.setdefault(DOMAIN, {}).setdefault(entry.entry_id, {}),
+                runtime=runtime,
                 device_identifiers=device_identifiers,
             )
         )
+        entities.append(
+            SmartEcoResumeSensor(
+                entry_id=entry.entry_id,
+                name=name,
+                runtime=runtime,
+                device_identifiers=device_identifiers,
+            )
+        )
+        if data.get(CONF_ECO_PRICE_SENSOR):
+            entities.append(
+                SmartEcoNextWindowSensor(
+                    entry_id=entry.entry_id,
+                    name=name,
+                    runtime=runtime,
+                    device_identifiers=device_identifiers,
+                )
+            )
 
     if data.get(CONF_ENABLE_MAX_TEMP_HISTORY_SENSOR, False):
         entities.append(
@@ -126,9 +236,27 @@ async def async_setup_entry(hass, entry, async_add_entities):
                 source_sensor_entity_id=source_sensor_entity_id,
                 device_identifier=entry.entry_id,
                 device_identifiers=device_identifiers,
+                bucket_seconds=int(data.get(CONF_MAX_TEMP_HISTORY_BUCKET_MINUTES, 0) or 0) * 60,
             )
         )
 
+    statistics = entry.runtime_data.temperature_statistics
+    if data.get(CONF_ENABLE_TEMPERATURE_STATISTICS_SENSORS, False) and statistics is not None:
+        from .statistics import STATISTICS, STATISTICS_WINDOWS
+
+        entities.extend(
+            TemperatureStatisticSensor(
+                entry_id=entry.entry_id,
+                name=name,
+                statistics=statistics,
+                window_key=window_key,
+                statistic=statistic,
+                device_identifiers=device_identifiers,
+            )
+            for window_key in STATISTICS_WINDOWS
+            for statistic in STATISTICS
+        )
+
     if entities:
         async_add_entities(entities)
 
@@ -140,7 +268,7 @@ class SmartEcoStateSensor(SensorEntity):
     _attr_has_entity_name = True
     _attr_name = "Smart Eco State"
 
-    def __init__(self, hass, entry_id: str, name: str | None, runtime: dict, device_identifiers):
+    def __init__(self, hass, entry_id: str, name: str | None, runtime, device_identifiers):
         """Initialize Smart Eco state sensor."""
         self.hass = hass
         self._entry_id = entry_id
@@ -155,7 +283,7 @@ class SmartEcoStateSensor(SensorEntity):
     @property
     def native_value(self):
         """Return Smart Eco state label."""
-        return self._runtime.get("smart_eco_state", "Off")
+        return self._runtime.smart_eco_state
 
     @property
     def device_info(self):
@@ -168,17 +296,106 @@ class SmartEcoStateSensor(SensorEntity):
     async def async_added_to_hass(self) -> None:
         """Subscribe to Smart Eco state updates."""
         await super().async_added_to_hass()
-        self.async_on_remove(
-            async_dispatcher_connect(
-                self.hass,
-                smart_eco_state_signal(self._entry_id),
-                self._async_handle_smart_eco_state_signal,
-            )
-        )
+        self.async_on_remove(self._runtime.async_add_listener(self._async_handle_runtime_update))
 
-    def _async_handle_smart_eco_state_signal(self, _payload) -> None:
-        """Handle Smart Eco state updates."""
-        self.schedule_update_ha_state()
+    @callback
+    def _async_handle_runtime_update(self, changed: frozenset[str]) -> None:
+        """Write state when the Smart Eco state label changes."""
+        if "smart_eco_state" in changed:
+            self.async_write_ha_state()
+
+
+class SmartEcoResumeSensor(SensorEntity):
+    """Expose when a manual Smart Eco override ends as a timestamp."""
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_should_poll = False
+    _attr_has_entity_name = True
+    _attr_name = "Smart Eco Resume"
+
+    def __init__(self, entry_id: str, name: str | None, runtime, device_identifiers) -> None:
+        """Initialize Smart Eco resume sensor."""
+        self._entry_id = entry_id
+        self._runtime = runtime
+        self._device_identifiers = device_identifiers
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_smart_eco_resume"
+
+        if not device_identifiers and name:
+            self._attr_name = f"{name} Smart Eco Resume"
+            self._attr_has_entity_name = False
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Return the time the temporary override ends, if one is running."""
+        if self._runtime.smart_eco_pause_reason != "manual_off_timer":
+            return None
+
+        resume_at = self._runtime.smart_eco_resume_at
+        return dt_util.parse_datetime(resume_at) if resume_at else None
+
+    @property
+    def device_info(self):
+        """Return device information for device registry."""
+        if self._device_identifiers:
+            return {"identifiers": self._device_identifiers}
+
+        return {"identifiers": {(DOMAIN, self._entry_id)}}
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to Smart Eco resume time updates."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._runtime.async_add_listener(self._async_handle_runtime_update))
+
+    @callback
+    def _async_handle_runtime_update(self, changed: frozenset[str]) -> None:
+        """Write state when the resume time or pause reason changes."""
+        if not changed.isdisjoint(_RESUME_FIELDS):
+            self.async_write_ha_state()
+
+
+class SmartEcoNextWindowSensor(SensorEntity):
+    """Expose when the next planned cheap-price heating window starts."""
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_should_poll = False
+    _attr_has_entity_name = True
+    _attr_name = "Smart Eco Next Window"
+
+    def __init__(self, entry_id: str, name: str | None, runtime, device_identifiers) -> None:
+        """Initialize Smart Eco next window sensor."""
+        self._entry_id = entry_id
+        self._runtime = runtime
+        self._device_identifiers = device_identifiers
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_smart_eco_next_window"
+
+        if not device_identifiers and name:
+            self._attr_name = f"{name} Smart Eco Next Window"
+            self._attr_has_entity_name = False
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Return the start of the next planned window, if one is known."""
+        next_window = self._runtime.smart_eco_next_window
+        return dt_util.parse_datetime(next_window) if next_window else None
+
+    @property
+    def device_info(self):
+        """Return device information for device registry."""
+        if self._device_identifiers:
+            return {"identifiers": self._device_identifiers}
+
+        return {"identifiers": {(DOMAIN, self._entry_id)}}
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to price plan updates."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._runtime.async_add_listener(self._async_handle_runtime_update))
+
+    @callback
+    def _async_handle_runtime_update(self, changed: frozenset[str]) -> None:
+        """Write state when the next window changes."""
+        if "smart_eco_next_window" in changed:
+            self.async_write_ha_state()
 
 
 class MaxTemperatureHistorySensor(SensorEntity, RestoreEntity):
@@ -195,12 +412,20 @@ class MaxTemperatureHistorySensor(SensorEntity, RestoreEntity):
         source_sensor_entity_id: str,
         device_identifier: str,
         device_identifiers,
+        bucket_seconds: int = 0,
     ) -> None:
         """Initialize the max temperature history sensor."""
         self._source_sensor_entity_id = source_sensor_entity_id
         self._device_identifier = device_identifier
         self._device_identifiers = device_identifiers
-        self._history: list[tuple[datetime, float]] = []
+        # When set, samples are merged into one max entry per bucket of this size.
+        self._bucket_seconds = int(bucket_seconds or 0)
+        self._last_bucket: int | None = None
+        self._samples_in_window = 0
+        self._history: deque[tuple[datetime, float, int]] = deque()
+        # Monotonic (non-increasing temperature) view of the window; its head is the
+        # earliest sample holding the current maximum.
+        self._max_window: deque[tuple[datetime, float]] = deque()
         self._max_recorded_at: datetime | None = None
         self._attr_unique_id = f"{DOMAIN}_{device_identifier}_highest_temperature_7_days"
         self._attr_native_value = None
@@ -224,8 +449,10 @@ class MaxTemperatureHistorySensor(SensorEntity, RestoreEntity):
     def extra_state_attributes(self):
         """Return extra sensor attributes."""
         attributes = {
-            _ATTR_SAMPLES_TRACKED: len(self._history),
+            _ATTR_SAMPLES_TRACKED: self._samples_in_window,
         }
+        if self._bucket_seconds:
+            attributes[_ATTR_BUCKETS_TRACKED] = len(self._history)
         if self._max_recorded_at is not None:
             attributes[_ATTR_MAX_RECORDED_AT] = self._max_recorded_at.isoformat()
         return attributes
@@ -237,11 +464,8 @@ class MaxTemperatureHistorySensor(SensorEntity, RestoreEntity):
             self.native_value,
             self.native_unit_of_measurement,
             [
-                {
-                    "timestamp": timestamp.isoformat(),
-                    "temperature": temperature,
-                }
-                for timestamp, temperature in self._history
+                (timestamp.timestamp(), temperature, count)
+                for timestamp, temperature, count in self._history
             ],
         )
 
@@ -252,12 +476,12 @@ class MaxTemperatureHistorySensor(SensorEntity, RestoreEntity):
         if (stored := await self.async_get_last_sensor_data()) is not None:
             self._attr_native_value = stored.native_value
             self._attr_native_unit_of_measurement = stored.native_unit_of_measurement
-            self._history = []
-            for item in stored.history:
-                parsed = dt_util.parse_datetime(item["timestamp"])
-                if parsed is None:
-                    continue
-                self._history.append((parsed, float(item["temperature"])))
+            self._history.clear()
+            self._max_window.clear()
+            self._samples_in_window = 0
+            self._last_bucket = None
+            for timestamp, temperature, count in sorted(stored.history):
+                self._append_sample(dt_util.utc_from_timestamp(timestamp), temperature, count)
             self._prune_history(dt_util.utcnow())
             self._recalculate_state()
 
@@ -316,24 +540,142 @@ class MaxTemperatureHistorySensor(SensorEntity, RestoreEntity):
             self._attr_native_unit_of_measurement = unit_of_measurement
 
         timestamp = when or dt_util.utcnow()
-        self._history.append((timestamp, temperature))
+        self._append_sample(timestamp, temperature)
         self._prune_history(timestamp)
         self._recalculate_state()
 
+    @callback
+    def _append_sample(self, timestamp: datetime, temperature: float, count: int = 1) -> None:
+        """Append a sample to the window in amortized O(1)."""
+        self._samples_in_window += count
+        history = self._history
+        max_window = self._max_window
+
+        if self._bucket_seconds:
+            bucket = int(timestamp.timestamp()) // self._bucket_seconds
+            if bucket == self._last_bucket and history:
+                kept_timestamp, kept_temperature, kept_count = history[-1]
+                if temperature <= kept_temperature:
+                    history[-1] = (kept_timestamp, kept_temperature, kept_count + count)
+                    return
+
+                # The open bucket is always the newest entry, so it sits at the
+                # tail of the monotonic view and can be replaced in place.
+                history[-1] = (timestamp, temperature, kept_count + count)
+                if max_window and max_window[-1][0] == kept_timestamp:
+                    max_window.pop()
+                self._push_max(timestamp, temperature)
+                return
+
+            self._last_bucket = bucket
+
+        history.append((timestamp, temperature, count))
+        self._push_max(timestamp, temperature)
+
+    @callback
+    def _push_max(self, timestamp: datetime, temperature: float) -> None:
+        """Push a sample onto the monotonic max view."""
+        # Samples that are strictly colder than the new one can never become the
+        # maximum again. Equal values are kept so the earliest one stays reported.
+        max_window = self._max_window
+        while max_window and max_window[-1][1] < temperature:
+            max_window.pop()
+        max_window.append((timestamp, temperature))
+
     @callback
     def _prune_history(self, reference: datetime) -> None:
         """Keep only samples inside the rolling 7-day window."""
         cutoff = reference - _WINDOW
-        self._history = [item for item in self._history if item[0] >= cutoff]
+        history = self._history
+        while history and history[0][0] < cutoff:
+            self._samples_in_window -= history.popleft()[2]
+
+        max_window = self._max_window
+        while max_window and max_window[0][0] < cutoff:
+            max_window.popleft()
 
     @callback
     def _recalculate_state(self) -> None:
         """Recalculate the sensor state from the retained history."""
-        if not self._history:
+        if not self._max_window:
             self._attr_native_value = None
             self._max_recorded_at = None
             return
 
-        timestamp, temperature = max(self._history, key=lambda item: item[1])
+        timestamp, temperature = self._max_window[0]
         self._attr_native_value = temperature
-        self._max_recorded_at = timestamp
\ No newline at end of file
+        self._max_recorded_at = timestamp
+
+
+_STATISTIC_NAMES = {
+    "min": "Lowest",
+    "max": "Highest",
+    "mean": "Mean",
+}
+_WINDOW_NAMES = {
+    "24h": "24 hours",
+    "7d": "7 days",
+    "30d": "30 days",
+}
+
+
+class TemperatureStatisticSensor(SensorEntity):
+    """Expose one statistic of one rolling window from the shared engine."""
+
+    _attr_device_class = SensorDeviceClass.TEMPERATURE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        entry_id: str,
+        name: str | None,
+        statistics,
+        window_key: str,
+        statistic: str,
+        device_identifiers,
+    ) -> None:
+        """Initialize the temperature statistic sensor."""
+        self._entry_id = entry_id
+        self._statistics = statistics
+        self._window_key = window_key
+        self._statistic = statistic
+        self._device_identifiers = device_identifiers
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_temperature_{statistic}_{window_key}"
+        self._attr_name = f"{_STATISTIC_NAMES[statistic]} Temperature ({_WINDOW_NAMES[window_key]})"
+        # Only the 24-hour window is enabled out of the box; longer windows are opt-in.
+        self._attr_entity_registry_enabled_default = window_key == "24h"
+
+        if not device_identifiers and name:
+            self._attr_name = f"{name} {self._attr_name}"
+            self._attr_has_entity_name = False
+
+    @property
+    def device_info(self):
+        """Return device information for the device registry."""
+        if self._device_identifiers:
+            return {"identifiers": self._device_identifiers}
+
+        return {"identifiers": {(DOMAIN, self._entry_id)}}
+
+    @property
+    def native_value(self):
+        """Return the statistic value."""
+        return self._statistics.value(self._window_key, self._statistic)
+
+    @property
+    def native_unit_of_measurement(self):
+        """Return the unit reported by the source sensor."""
+        return self._statistics.unit_of_measurement
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to statistics updates."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                temperature_statistics_signal(self._entry_id),
+                self.async_write_ha_state,
+            )
+        )
@@ -0,0 +1,313 @@
+"""Rolling temperature statistics shared by the sensors of a config entry."""
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import Event, EventStateChangedData, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import (
+    async_track_state_change_event,
+    async_track_time_interval,
+)
+from homeassistant.helpers.storage import Store
+import homeassistant.util.dt as dt_util
+
+from . import DOMAIN, temperature_statistics_signal
+
+_LOGGER = logging.getLogger(__name__)
+
+_STORAGE_VERSION = 1
+_SAVE_DELAY = 300
+
+STATISTIC_MIN = "min"
+STATISTIC_MAX = "max"
+STATISTIC_MEAN = "mean"
+STATISTICS = (STATISTIC_MIN, STATISTIC_MAX, STATISTIC_MEAN)
+
+# Window key -> (window length, bucket size in seconds). Buckets keep each window
+# at a few thousand entries at most.
+STATISTICS_WINDOWS: dict[str, tuple[timedelta, int]] = {
+    "24h": (timedelta(hours=24), 60),
+    "7d": (timedelta(days=7), 300),
+    "30d": (timedelta(days=30), 900),
+}
+# Expire buckets at the finest bucket size, so a quiet sensor cannot leave
+# values from outside a window on display.
+_EXPIRE_INTERVAL = timedelta(
+    seconds=min(bucket_seconds for _window, bucket_seconds in STATISTICS_WINDOWS.values())
+)
+
+
+def _statistics_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the storage helper holding statistics for a config entry."""
+    return Store(hass, _STORAGE_VERSION, f"{DOMAIN}.{entry_id}.statistics")
+
+
+async def async_remove_statistics(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove stored statistics for a deleted config entry."""
+    await _statistics_store(hass, entry_id).async_remove()
+
+
+class RollingWindowStatistics:
+    """Incremental min/max/mean over a rolling, bucketed time window.
+
+    Each bucket holds ``[index, min, max, total, count]``. Running sums give the
+    mean, and two monotonic deques of bucket extremes give min and max, so adding
+    a sample and expiring old buckets are amortized O(1).
+    """
+
+    def __init__(self, window: timedelta, bucket_seconds: int) -> None:
+        """Initialize an empty window."""
+        self._window_seconds = int(window.total_seconds())
+        self._bucket_seconds = bucket_seconds
+        self._buckets: deque[list] = deque()
+        self._min_view: deque[tuple[int, float]] = deque()
+        self._max_view: deque[tuple[int, float]] = deque()
+        self._total = 0.0
+        self._count = 0
+
+    @property
+    def minimum(self) -> float | None:
+        """Return the lowest value in the window."""
+        return self._min_view[0][1] if self._min_view else None
+
+    @property
+    def maximum(self) -> float | None:
+        """Return the highest value in the window."""
+        return self._max_view[0][1] if self._max_view else None
+
+    @property
+    def mean(self) -> float | None:
+        """Return the sample mean of the window."""
+        if not self._count:
+            return None
+        return self._total / self._count
+
+    @property
+    def count(self) -> int:
+        """Return the number of samples in the window."""
+        return self._count
+
+    def value(self, statistic: str) -> float | None:
+        """Return the value of one statistic."""
+        if statistic == STATISTIC_MIN:
+            return self.minimum
+        if statistic == STATISTIC_MAX:
+            return self.maximum
+        return self.mean
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a sample taken at the given epoch timestamp."""
+        buckets = self._buckets
+        index = int(timestamp) // self._bucket_seconds
+        if buckets and index < buckets[-1][0]:
+            # Late sample for an older bucket; fold it into the newest one so
+            # the deques stay ordered.
+            index = buckets[-1][0]
+
+        self._expire(index)
+        self._total += value
+        self._count += 1
+
+        if buckets and buckets[-1][0] == index:
+            bucket = buckets[-1]
+            bucket[3] += value
+            bucket[4] += 1
+            if value < bucket[1]:
+                bucket[1] = value
+                # The open bucket is always the tail of both views.
+                self._min_view.pop()
+                self._push_min(index, value)
+            if value > bucket[2]:
+                bucket[2] = value
+                self._max_view.pop()
+                self._push_max(index, value)
+            return
+
+        buckets.append([index, value, value, value, 1])
+        self._push_min(index, value)
+        self._push_max(index, value)
+
+    def expire(self, timestamp: float) -> bool:
+        """Drop buckets that left the window at the given epoch timestamp.
+
+        Return whether any bucket was dropped.
+        """
+        return self._expire(int(timestamp) // self._bucket_seconds)
+
+    def _expire(self, current_index: int) -> bool:
+        """Drop buckets older than the window relative to a bucket index."""
+        oldest = current_index - self._window_seconds // self._bucket_seconds + 1
+        buckets = self._buckets
+        if not buckets or buckets[0][0] >= oldest:
+            return False
+        while buckets and buckets[0][0] < oldest:
+            bucket = buckets.popleft()
+            self._total -= bucket[3]
+            self._count -= bucket[4]
+        while self._min_view and self._min_view[0][0] < oldest:
+            self._min_view.popleft()
+        while self._max_view and self._max_view[0][0] < oldest:
+            self._max_view.popleft()
+        if not buckets:
+            self._total = 0.0
+            self._count = 0
+        return True
+
+    def _push_min(self, index: int, value: float) -> None:
+        """Push a bucket minimum onto the non-decreasing min view."""
+        min_view = self._min_view
+        while min_view and min_view[-1][1] > value:
+            min_view.pop()
+        min_view.append((index, value))
+
+    def _push_max(self, index: int, value: float) -> None:
+        """Push a bucket maximum onto the non-increasing max view."""
+        max_view = self._max_view
+        while max_view and max_view[-1][1] < value:
+            max_view.pop()
+        max_view.append((index, value))
+
+    def as_list(self) -> list[list]:
+        """Return buckets in a JSON serializable form."""
+        return [list(bucket) for bucket in self._buckets]
+
+    def restore(self, buckets: Any) -> None:
+        """Rebuild the window from stored buckets."""
+        if not isinstance(buckets, list):
+            return
+
+        for item in buckets:
+            try:
+                index, minimum, maximum, total, count = (
+                    int(item[0]),
+                    float(item[1]),
+                    float(item[2]),
+                    float(item[3]),
+                    int(item[4]),
+                )
+            except (IndexError, TypeError, ValueError):
+                continue
+            if count <= 0 or (self._buckets and index <= self._buckets[-1][0]):
+                continue
+
+            self._buckets.append([index, minimum, maximum, total, count])
+            self._total += total
+            self._count += count
+            self._push_min(index, minimum)
+            self._push_max(index, maximum)
+
+
+class TemperatureStatistics:
+    """Feed every statistics window of an entry from one sensor subscription."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, sensor_entity_id: str) -> None:
+        """Initialize the statistics engine."""
+        self.hass = hass
+        self._entry_id = entry_id
+        self._sensor_entity_id = sensor_entity_id
+        self._store = _statistics_store(hass, entry_id)
+        self._unsub_state = None
+        self._unsub_expire = None
+        self.unit_of_measurement: str | None = None
+        self.windows = {
+            key: RollingWindowStatistics(window, bucket_seconds)
+            for key, (window, bucket_seconds) in STATISTICS_WINDOWS.items()
+        }
+
+    def value(self, window_key: str, statistic: str) -> float | None:
+        """Return one statistic of one window."""
+        value = self.windows[window_key].value(statistic)
+        return None if value is None else round(value, 2)
+
+    async def async_start(self) -> None:
+        """Restore stored windows and start tracking the temperature sensor."""
+        restored = False
+        if (stored := await self._store.async_load()) is not None:
+            self.unit_of_measurement = stored.get("unit_of_measurement")
+            windows = stored.get("windows") or {}
+            for key, window in self.windows.items():
+                window.restore(windows.get(key))
+                restored = restored or window.count > 0
+
+        now = dt_util.utcnow().timestamp()
+        for window in self.windows.values():
+            window.expire(now)
+
+        self._unsub_state = async_track_state_change_event(
+            self.hass,
+            [self._sensor_entity_id],
+            self._async_sensor_changed,
+        )
+        self._unsub_expire = async_track_time_interval(
+            self.hass, self._async_expire_windows, _EXPIRE_INTERVAL
+        )
+
+        if not restored and (state := self.hass.states.get(self._sensor_entity_id)) is not None:
+            self._async_add_sample(state.state, state.attributes.get("unit_of_measurement"), now)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop tracking and flush the windows to storage."""
+        if self._unsub_state is not None:
+            self._unsub_state()
+            self._unsub_state = None
+        if self._unsub_expire is not None:
+            self._unsub_expire()
+            self._unsub_expire = None
+        self._store.async_delay_save(self._data_to_save, 0)
+
+    @callback
+    def _async_sensor_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Handle temperature sensor updates."""
+        new_state = event.data.get("new_state")
+        if new_state is None:
+            return
+
+        self._async_add_sample(
+            new_state.state,
+            new_state.attributes.get("unit_of_measurement"),
+            event.time_fired.timestamp(),
+        )
+
+    @callback
+    def _async_expire_windows(self, now: datetime) -> None:
+        """Expire old buckets without a new sample and notify the sensors."""
+        timestamp = now.timestamp()
+        expired = [window.expire(timestamp) for window in self.windows.values()]
+        if any(expired):
+            self._store.async_delay_save(self._data_to_save, _SAVE_DELAY)
+            async_dispatcher_send(self.hass, temperature_statistics_signal(self._entry_id))
+
+    @callback
+    def _async_add_sample(self, state_value: Any, unit_of_measurement: str | None, timestamp: float) -> None:
+        """Add a numeric sample to every window and notify the sensors."""
+        if state_value in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return
+
+        try:
+            temperature = float(state_value)
+        except (TypeError, ValueError):
+            _LOGGER.debug("Ignoring non-numeric temperature state %s", state_value)
+            return
+
+        if unit_of_measurement:
+            self.unit_of_measurement = unit_of_measurement
+
+        for window in self.windows.values():
+            window.add(timestamp, temperature)
+
+        self._store.async_delay_save(self._data_to_save, _SAVE_DELAY)
+        async_dispatcher_send(self.hass, temperature_statistics_signal(self._entry_id))
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return data for the storage helper."""
+        return {
+            "unit_of_measurement": self.unit_of_measurement,
+            "windows": {key: window.as_list() for key, window in self.windows.items()},
+        }
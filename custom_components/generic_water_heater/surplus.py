@@ -0,0 +1,182 @@
+"""Solar-surplus Smart Eco source decided on exported energy over a rolling window.
+
+Inverter and grid meters report power every few seconds, so single readings
+are too noisy to switch a heater on. The tracker integrates the export power
+over the last N minutes and compares the window average instead: heating is
+allowed once the average export reaches the configured surplus, and stays
+allowed while the site keeps exporting on average, so the heater's own draw
+does not switch it straight back off.
+"""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Coroutine
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT, UnitOfPower
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HassJob,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.helpers.event import (
+    async_track_state_change_event,
+    async_track_time_interval,
+)
+
+from . import DOMAIN
+
+# Re-check interval for meters that only report changes; the window keeps sliding.
+_IDLE_CHECK_INTERVAL = timedelta(seconds=30)
+
+
+class RollingEnergy:
+    """Energy of a piecewise-constant power signal over a sliding window.
+
+    Each sample closes the previous constant-power segment. Closed segments
+    are kept in a deque with a running energy total, so adding a sample and
+    reading the average are amortized O(1) whatever the sample rate.
+    """
+
+    __slots__ = ("window", "_segments", "_energy", "_last_time", "_last_power")
+
+    def __init__(self, window: float) -> None:
+        """Initialize an empty window of the given length in seconds."""
+        self.window = window
+        # (start, end, power) of closed segments overlapping the window.
+        self._segments: deque[tuple[float, float, float]] = deque()
+        self._energy = 0.0
+        self._last_time: float | None = None
+        self._last_power = 0.0
+
+    def add(self, now: float, power: float) -> None:
+        """Record that the power is ``power`` from ``now`` on."""
+        if self._last_time is not None and now > self._last_time:
+            self._segments.append((self._last_time, now, self._last_power))
+            self._energy += self._last_power * (now - self._last_time)
+        if self._last_time is None or now > self._last_time:
+            self._last_time = now
+        self._last_power = power
+        self._trim(now)
+
+    def average(self, now: float) -> float:
+        """Return the average power over the window ending at now.
+
+        Time before the first sample counts as zero power, so a fresh window
+        has to fill up before it can reach a positive threshold.
+        """
+        self._trim(now)
+        energy = self._energy
+        if self._last_time is not None:
+            energy += self._last_power * (now - max(self._last_time, now - self.window))
+        return energy / self.window
+
+    def _trim(self, now: float) -> None:
+        """Drop energy that has left the window."""
+        cutoff = now - self.window
+        segments = self._segments
+        while segments and segments[0][1] <= cutoff:
+            start, end, power = segments.popleft()
+            self._energy -= power * (end - start)
+        if not segments:
+            # Resync the running total so rounding errors cannot accumulate.
+            self._energy = 0.0
+        elif segments[0][0] < cutoff:
+            start, end, power = segments[0]
+            self._energy -= power * (cutoff - start)
+            segments[0] = (cutoff, end, power)
+
+
+def _export_watts(state: State | None) -> float:
+    """Return the exported power of a meter state in watts; unknown is zero."""
+    if state is None:
+        return 0.0
+    try:
+        power = float(state.state)
+    except ValueError:
+        return 0.0
+    if state.attributes.get(ATTR_UNIT_OF_MEASUREMENT) == UnitOfPower.KILO_WATT:
+        power *= 1000
+    return power
+
+
+class SurplusTracker:
+    """Allow heating on integrated export surplus and report decision changes.
+
+    The tracker has the same ``async_start``/``result`` interface as the eco
+    condition tracker, so the water heater treats it as its eco source.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entity_id: str,
+        surplus_power: float,
+        window: timedelta,
+        action: Callable[[bool, Event[EventStateChangedData] | None], Coroutine[Any, Any, None] | None],
+    ) -> None:
+        """Initialize the tracker."""
+        self.hass = hass
+        self.entity_id = entity_id
+        self._surplus_power = float(surplus_power)
+        self._energy = RollingEnergy(window.total_seconds())
+        self._job = HassJob(action, f"{DOMAIN} surplus listener")
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self._samples = 0
+        self.result = False
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start integrating the meter; return a callback that stops it."""
+        self._energy.add(self.hass.loop.time(), _export_watts(self.hass.states.get(self.entity_id)))
+        self._unsubs = [
+            async_track_state_change_event(self.hass, [self.entity_id], self._async_power_changed),
+            async_track_time_interval(self.hass, self._async_interval, _IDLE_CHECK_INTERVAL),
+        ]
+        return self.async_stop
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop tracking the meter."""
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    @property
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the window average and the decision thresholds."""
+        return {
+            "power_sensor": self.entity_id,
+            "window_s": self._energy.window,
+            "average_export_w": round(self._energy.average(self.hass.loop.time()), 1),
+            "surplus_power_w": self._surplus_power,
+            "samples": self._samples,
+        }
+
+    @callback
+    def _async_power_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Integrate a new power reading and re-evaluate."""
+        now = self.hass.loop.time()
+        self._samples += 1
+        self._energy.add(now, _export_watts(event.data["new_state"]))
+        self._async_evaluate(event, now)
+
+    @callback
+    def _async_interval(self, _now: datetime) -> None:
+        """Re-evaluate as the window slides past a steady reading."""
+        self._async_evaluate(None, self.hass.loop.time())
+
+    @callback
+    def _async_evaluate(self, event: Event[EventStateChangedData] | None, now: float) -> None:
+        """Report the decision when it changes."""
+        average = self._energy.average(now)
+        # Start on the configured surplus; keep going while still exporting on average.
+        result = average >= (0.0 if self.result else self._surplus_power)
+        if result == self.result:
+            return
+        self.result = result
+        self.hass.async_run_hass_job(self._job, result, event)
@@ -0,0 +1,106 @@
+"""Keyed deadline scheduler backing the water heater entity timers."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import heapq
+from typing import Any
+
+from homeassistant.core import HassJob, HomeAssistant, callback
+import homeassistant.util.dt as dt_util
+
+
+class EntityTimers:
+    """Hold named deadlines for one entity behind a single loop timer.
+
+    Scheduling a key replaces its previous deadline. Deadlines sit in a heap with
+    lazy deletion, and only the earliest one is armed on the event loop, so
+    re-arming or cancelling a key never touches more than one loop handle.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty scheduler."""
+        self.hass = hass
+        # key -> (loop deadline, sequence, wall-clock deadline, job)
+        self._deadlines: dict[str, tuple[float, int, datetime, HassJob]] = {}
+        self._heap: list[tuple[float, int, str]] = []
+        self._sequence = 0
+        self._handle = None
+        self._armed_at: float | None = None
+
+    def schedule(self, key: str, delay: float, action: Callable[[datetime], Any]) -> None:
+        """Run ``action(now)`` after ``delay`` seconds, replacing any deadline for key."""
+        delay = max(0.0, delay)
+        self._sequence += 1
+        when = self.hass.loop.time() + delay
+        self._deadlines[key] = (
+            when,
+            self._sequence,
+            dt_util.utcnow() + timedelta(seconds=delay),
+            HassJob(action, f"generic_water_heater timer {key}"),
+        )
+        heapq.heappush(self._heap, (when, self._sequence, key))
+        if self._armed_at is None or when < self._armed_at:
+            self._arm(when)
+
+    def cancel(self, key: str) -> None:
+        """Cancel the deadline for key, if any."""
+        # The heap entry is discarded lazily when it reaches the top.
+        self._deadlines.pop(key, None)
+        if not self._deadlines:
+            self.cancel_all()
+
+    def cancel_all(self) -> None:
+        """Cancel every deadline and the armed loop timer."""
+        self._deadlines.clear()
+        self._heap.clear()
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._armed_at = None
+
+    def is_scheduled(self, key: str) -> bool:
+        """Return whether key has a pending deadline."""
+        return key in self._deadlines
+
+    def pending(self) -> dict[str, str]:
+        """Return pending deadlines as ISO timestamps, earliest first."""
+        return {
+            key: entry[2].isoformat()
+            for key, entry in sorted(self._deadlines.items(), key=lambda item: item[1][0])
+        }
+
+    def _arm(self, when: float) -> None:
+        """Arm the loop timer for the given loop time."""
+        if self._handle is not None:
+            self._handle.cancel()
+        self._armed_at = when
+        self._handle = self.hass.loop.call_at(when, self._async_fire)
+
+    @callback
+    def _async_fire(self) -> None:
+        """Run every due deadline and re-arm for the next one."""
+        self._handle = None
+        self._armed_at = None
+        now = self.hass.loop.time()
+        due: list[HassJob] = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _when, sequence, key = heapq.heappop(heap)
+            entry = self._deadlines.get(key)
+            if entry is None or entry[1] != sequence:
+                continue
+            del self._deadlines[key]
+            due.append(entry[3])
+
+        # Drop stale entries so the armed timer always belongs to a live deadline.
+        while heap and (
+            (entry := self._deadlines.get(heap[0][2])) is None or entry[1] != heap[0][1]
+        ):
+            heapq.heappop(heap)
+        if heap:
+            self._arm(heap[0][0])
+
+        utcnow = dt_util.utcnow()
+        for job in due:
+            self.hass.async_run_hass_job(job, utcnow)
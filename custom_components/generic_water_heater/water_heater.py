@@ -24,18 +24,9 @@ from homeassistant.const import (
 )
 from homeassistant.core import DOMAIN as HA_DOMAIN, Event, EventStateChangedData, callback
 from homeassistant.exceptions import TemplateError
-from homeassistant.helpers.event import (
-    TrackTemplate,
-    TrackTemplateResult,
-    async_call_later,
-    async_track_state_change_event,
-    async_track_template_result,
-)
-from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.helpers.restore_state import RestoreEntity
-from homeassistant.helpers import device_registry as dr, entity_registry as er
-import homeassistant.helpers.config_validation as cv
-from homeassistant.helpers.template import Template, result_as_boolean
+from homeassistant.helpers import issue_registry as ir
 
 from homeassistant.const import UnitOfTemperature
 from homeassistant.util.unit_conversion import TemperatureConverter
@@ -44,13 +35,22 @@ import homeassistant.util.dt as dt_util
 from . import (
     CONF_COLD_TOLERANCE,
     CONF_DEBUG_LOGGING,
+    CONF_ECO_PRICE_CHEAPEST_SLOTS,
+    CONF_ECO_PRICE_PERCENTILE,
+    CONF_ECO_PRICE_SENSOR,
+    CONF_ECO_SURPLUS_POWER,
+    CONF_ECO_SURPLUS_SENSOR,
+    CONF_ECO_SURPLUS_WINDOW_MINUTES,
     CONF_ECO_TEMPLATE,
     CONF_HEATER,
     CONF_HOT_TOLERANCE,
+    CONF_SMART_ECO_COUNTDOWN_STATE,
     CONF_SMART_ECO_MANUAL_OFF_RESUME_HOURS,
     CONF_MIN_OFF_DURATION,
     CONF_MIN_ON_DURATION,
+    CONF_SCHEDULE,
     CONF_SENSOR,
+    CONF_SWITCH_CONFIRM_TIMEOUT,
     CONF_TARGET_TEMP,
     CONF_TEMP_MAX,
     CONF_TEMP_MIN,
@@ -60,13 +60,24 @@ from . import (
     SMART_ECO_MODE_AUTO_RESUME,
     SMART_ECO_MODE_OFF,
     SMART_ECO_MODE_UNTIL_MANUAL,
-    smart_eco_signal,
-    smart_eco_state_signal,
 )
+from .timers import EntityTimers
 
 _LOGGER = logging.getLogger(__name__)
 
 DEFAULT_NAME = "Generic Water Heater"
+DEFAULT_SWITCH_CONFIRM_TIMEOUT = 10
+# Commands are re-sent with a doubling deadline; after this many unconfirmed
+# attempts the switch is reported as unresponsive.
+_MAX_COMMAND_ATTEMPTS = 4
+
+# Keys of the deadlines held by each entity's timer wheel.
+_TIMER_COOLDOWN = "cooldown"
+_TIMER_SMART_ECO_RESUME = "smart_eco_resume"
+_TIMER_SMART_ECO_COUNTDOWN = "smart_eco_countdown"
+_TIMER_COMMAND_WATCHDOG = "command_watchdog"
+_TIMER_SCHEDULE = "schedule"
+_TIMER_TURN_ON_STAGGER = "turn_on_stagger"
 
 
 async def async_setup_entry(hass, entry, async_add_entities):
@@ -82,50 +93,15 @@ async def async_setup_entry(hass, entry, async_add_entities):
     hot_tolerance = data.get(CONF_HOT_TOLERANCE, 0.0)
     min_temp = data.get(CONF_TEMP_MIN, 15.0)
     max_temp = data.get(CONF_TEMP_MAX, 80.0)
-    min_on_duration = data.get(CONF_MIN_ON_DURATION, data.get("min_cycle_duration"))
-    min_off_duration = data.get(CONF_MIN_OFF_DURATION, data.get("min_cycle_duration"))
+    min_on_duration = _duration_option(data, CONF_MIN_ON_DURATION)
+    min_off_duration = _duration_option(data, CONF_MIN_OFF_DURATION)
     eco_template = (data.get(CONF_ECO_TEMPLATE) or "").strip() or None
     debug_logging = data.get(CONF_DEBUG_LOGGING, False)
     manual_off_resume_hours = data.get(CONF_SMART_ECO_MANUAL_OFF_RESUME_HOURS, 6)
     unit = hass.config.units.temperature_unit
-    runtime = hass.data.setdefault(DOMAIN, {}).setdefault(entry.entry_id, {})
-    if runtime.get("smart_eco_mode") is None:
-        # Smart Eco defaults to auto-resume policy when a template exists; otherwise Off.
-        runtime["smart_eco_mode"] = SMART_ECO_MODE_AUTO_RESUME if eco_template is not None else SMART_ECO_MODE_OFF
-    runtime.setdefault("smart_eco_pause_reason", None)
-    runtime.setdefault("smart_eco_resume_at", None)
-    runtime.setdefault("smart_eco_last_heating_mode", STATE_ELECTRIC)
-    runtime.setdefault("smart_eco_state", "Off")
-
-    registry = er.async_get(hass)
-    device_registry = dr.async_get(hass)
-    entity_entry = registry.async_get(heater_entity_id)
-    device_identifiers = None
-    current_device_id = None
-
-    if min_on_duration is not None and isinstance(min_on_duration, dict):
-        min_on_duration = cv.time_period(min_on_duration)
-        
-    if min_off_duration is not None and isinstance(min_off_duration, dict):
-        min_off_duration = cv.time_period(min_off_duration)
-
-    if entity_entry and entity_entry.device_id:
-        device_entry = device_registry.async_get(entity_entry.device_id)
-        if device_entry:
-            device_identifiers = device_entry.identifiers
-            current_device_id = device_entry.id
-
-    # Cleanup old device links for this config entry
-    linked_devices = dr.async_entries_for_config_entry(device_registry, entry.entry_id)
-    for dev in linked_devices:
-        if current_device_id and dev.id != current_device_id:
-            device_registry.async_update_device(dev.id, remove_config_entry_id=entry.entry_id)
-        elif not current_device_id:
-            # If no physical device is linked, ensure we don't keep links to old physical devices.
-            # Check if it's the standalone device (identifier matches entry_id)
-            is_standalone = any(dom == DOMAIN and ident == entry.entry_id for dom, ident in dev.identifiers)
-            if not is_standalone:
-                device_registry.async_update_device(dev.id, remove_config_entry_id=entry.entry_id)
+    runtime = entry.runtime_data
+
+    from .power_budget import budget_settings
 
     entity = GenericWaterHeater(
         hass,
@@ -146,9 +122,20 @@ async def async_setup_entry(hass, entry, async_add_entities):
         runtime,
         manual_off_resume_hours,
         config_entry_id=entry.entry_id,
-        device_identifiers=device_identifiers,
+        device_identifiers=runtime.device_identifiers,
+        switch_confirm_timeout=data.get(CONF_SWITCH_CONFIRM_TIMEOUT, DEFAULT_SWITCH_CONFIRM_TIMEOUT),
+        smart_eco_countdown_state=data.get(CONF_SMART_ECO_COUNTDOWN_STATE, False),
+        eco_conditions=runtime.eco_conditions,
+        schedule=_schedule_option(data, name),
+        eco_price_sensor=data.get(CONF_ECO_PRICE_SENSOR) or None,
+        eco_price_cheapest_slots=data.get(CONF_ECO_PRICE_CHEAPEST_SLOTS, 0),
+        eco_price_percentile=data.get(CONF_ECO_PRICE_PERCENTILE, 25),
+        eco_surplus_sensor=data.get(CONF_ECO_SURPLUS_SENSOR) or None,
+        eco_surplus_power=data.get(CONF_ECO_SURPLUS_POWER, 1000),
+        eco_surplus_window_minutes=data.get(CONF_ECO_SURPLUS_WINDOW_MINUTES, 10),
+        power_budget_settings=budget_settings(data),
     )
-    runtime["water_heater_entity"] = entity
+    runtime.water_heater_entity = entity
     async_add_entities([entity])
     return True
 
@@ -159,9 +146,60 @@ async def async_unload_entry(hass, entry):
     return True
 
 
+def _duration_option(data: dict, key: str):
+    """Return a duration option as a timedelta, falling back to min_cycle_duration."""
+    duration = data.get(key, data.get("min_cycle_duration"))
+    if duration is not None and isinstance(duration, dict):
+        # Duration selectors store days/hours/minutes/seconds keys.
+        duration = timedelta(**duration)
+    return duration
+
+
+def _schedule_option(data: dict, name: str):
+    """Return the compiled weekly schedule, or None when unset or invalid."""
+    if not data.get(CONF_SCHEDULE):
+        return None
+
+    from .schedule import ScheduleError, compile_schedule
+
+    try:
+        return compile_schedule(data[CONF_SCHEDULE])
+    except ScheduleError as err:
+        _LOGGER.error("%s: invalid schedule, it is not applied: %s", name, err)
+        return None
+
+
+def _is_attribute_only_change(event) -> bool:
+    """Return whether a state_changed event left the state value untouched."""
+    old_state = event.data.get("old_state")
+    new_state = event.data.get("new_state")
+    return (
+        old_state is not None
+        and new_state is not None
+        and old_state.state == new_state.state
+    )
+
+
 class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
     """Representation of a generic water_heater device."""
 
+    # Smart Eco attributes are mirrored by the Smart Eco entities and kept on the
+    # water heater for state restore only, so the recorder does not store them.
+    # The same goes for when the schedule was last applied.
+    _unrecorded_attributes = frozenset(
+        {
+            "schedule_applied_at",
+            "schedule_operation_mode",
+            "smart_eco_mode",
+            "smart_eco_pause_reason",
+            "smart_eco_resume_at",
+            "smart_eco_last_heating_mode",
+            "smart_eco_state",
+            "smart_eco_condition_met",
+            "smart_eco_price_plan",
+        }
+    )
+
     def __init__(
         self,
         hass,
@@ -183,6 +221,17 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
         manual_off_resume_hours,
         config_entry_id=None,
         device_identifiers=None,
+        switch_confirm_timeout=None,
+        smart_eco_countdown_state=False,
+        eco_conditions=None,
+        schedule=None,
+        eco_price_sensor=None,
+        eco_price_cheapest_slots=0,
+        eco_price_percentile=25,
+        eco_surplus_sensor=None,
+        eco_surplus_power=1000,
+        eco_surplus_window_minutes=10,
+        power_budget_settings=None,
     ):
         """Initialize the water_heater device."""
         self.hass = hass
@@ -198,16 +247,38 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
         self._max_temp = max_temp
         self._min_on_duration = min_on_duration if min_on_duration else timedelta(seconds=0)
         self._min_off_duration = min_off_duration if min_off_duration else timedelta(seconds=120)
-        self._eco_template = Template(eco_template, hass) if eco_template else None
+        # Template string; rendering is shared between entries by the eco template evaluator.
+        self._eco_template = eco_template or None
+        # Compiled structured conditions take precedence over the template.
+        self._eco_conditions = eco_conditions
+        self._eco_condition_tracker = None
+        # Price sensor whose forecast is planned into cheap heating windows.
+        self._eco_price_sensor = eco_price_sensor
+        self._eco_price_cheapest_slots = int(eco_price_cheapest_slots or 0)
+        self._eco_price_percentile = float(eco_price_percentile)
+        self._price_planner = None
+        self._price_plan_attribute = []
+        # Grid export power sensor whose rolling average allows surplus heating.
+        self._eco_surplus_sensor = eco_surplus_sensor
+        self._eco_surplus_power = float(eco_surplus_power)
+        self._eco_surplus_window = timedelta(minutes=float(eco_surplus_window_minutes))
+        self._surplus_tracker = None
+        self._has_eco_source = runtime.has_eco_source
+        # Compiled weekly schedule; one timer is armed for its next transition.
+        self._schedule = schedule
+        # When a schedule block was last applied; restored to spot missed transitions.
+        self._schedule_applied_at = None
+        # Operation mode set by the schedule; Smart Eco restores it instead of the
+        # last heating mode and leaves a scheduled off alone.
+        self._schedule_operation = None
+        # Smart Eco policy state lives on the shared runtime object, which notifies
+        # the select and sensors when it changes.
         self._runtime = runtime
-        self._smart_eco_mode = runtime.get("smart_eco_mode", SMART_ECO_MODE_OFF)
-        self._smart_eco_pause_reason = runtime.get("smart_eco_pause_reason")
-        self._smart_eco_resume_at = runtime.get("smart_eco_resume_at")
-        self._smart_eco_last_heating_mode = runtime.get("smart_eco_last_heating_mode", STATE_ELECTRIC)
         self._smart_eco_manual_off_resume_hours = int(manual_off_resume_hours)
         self._smart_eco_idle_since = None
-        self._smart_eco_resume_timer = None
-        self._smart_eco_countdown_timer = None
+        # The resume deadline is published as a timestamp; a ticking text label is opt-in.
+        self._smart_eco_countdown_state = bool(smart_eco_countdown_state)
+        self._timers = EntityTimers(hass)
         self._debug_logging = bool(debug_logging)
         self._eco_condition_met = False
         self._unit_of_measurement = unit
@@ -222,10 +293,30 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
         self._attr_should_poll = False
         self._device_identifiers = device_identifiers
         self._last_commanded_switch_state = None
+        # Last observed heater switch state, kept current by _async_switch_changed.
+        self._heater_state = None
         self._last_switch_change_time = None
-        self._cooldown_timer = None
         self._pending_switch_state = None
         self._last_debug_hvac_action = None
+        self._write_handle = None
+        self._last_written_snapshot = None
+        self._skipped_sensor_events = 0
+        self._skipped_switch_events = 0
+        self._control_running = False
+        self._control_rerun = False
+        # (state, issued_at, confirm_deadline, attempt) of the last switch command not yet echoed back.
+        self._inflight_command = None
+        self._switch_confirm_timeout = float(switch_confirm_timeout or DEFAULT_SWITCH_CONFIRM_TIMEOUT)
+        self._command_retries = 0
+        self._actuator_unresponsive = False
+        self._suppressed_duplicate_commands = 0
+        self._last_command_latency = None
+        self._average_command_latency = None
+        self._coalesced_control_requests = 0
+        # Site-wide budget that admits turn-ons; joined when the entity is added.
+        self._power_budget = None
+        self._power_budget_settings = power_budget_settings
+        self._last_turn_on_stagger = None
         # device/unique id
         # prefer config_entry_id (when created via UI) otherwise fall back to heater entity id
         self._device_identifier = config_entry_id or heater_entity_id
@@ -250,14 +341,77 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
     @property
     def extra_state_attributes(self):
         """Return the optional state attributes."""
+        attributes = {"hvac_action": self.hvac_action}
+        if self._has_eco_source:
+            smart_eco_attributes = {
+                "smart_eco_mode": self._runtime.smart_eco_mode,
+                "smart_eco_pause_reason": self._runtime.smart_eco_pause_reason,
+                "smart_eco_resume_at": self._runtime.smart_eco_resume_at,
+                "smart_eco_last_heating_mode": self._runtime.smart_eco_last_heating_mode,
+                "smart_eco_state": self._runtime.smart_eco_state,
+                "smart_eco_condition_met": self._eco_condition_met,
+            }
+            # Unset values are left out; restore treats a missing attribute as None.
+            attributes.update(
+                (key, value) for key, value in smart_eco_attributes.items() if value is not None
+            )
+            if self._price_planner is not None:
+                attributes["smart_eco_price_plan"] = self._price_plan_attribute
+        if self._schedule_applied_at is not None:
+            attributes["schedule_applied_at"] = self._schedule_applied_at.isoformat()
+        if self._schedule_operation is not None:
+            attributes["schedule_operation_mode"] = self._schedule_operation
+        if self._actuator_unresponsive:
+            attributes["actuator_unresponsive"] = True
+        return attributes
+
+    @property
+    def diagnostics(self) -> dict:
+        """Return runtime diagnostics for the config entry diagnostics dump."""
         return {
-            "hvac_action": self.hvac_action,
-            "smart_eco_mode": self._smart_eco_mode,
-            "smart_eco_pause_reason": self._smart_eco_pause_reason,
-            "smart_eco_resume_at": self._smart_eco_resume_at,
-            "smart_eco_last_heating_mode": self._smart_eco_last_heating_mode,
-            "smart_eco_state": self._runtime.get("smart_eco_state", "Off"),
-            "smart_eco_condition_met": self._eco_condition_met,
+            "heater_entity_id": self.heater_entity_id,
+            "sensor_entity_id": self.sensor_entity_id,
+            "current_operation": self._current_operation,
+            "current_temperature": self._current_temperature,
+            "target_temperature": self._target_temperature,
+            "heater_state": self._heater_state,
+            "last_commanded_switch_state": self._last_commanded_switch_state,
+            "pending_switch_state": self._pending_switch_state,
+            "last_switch_change_time": (
+                self._last_switch_change_time.isoformat()
+                if self._last_switch_change_time is not None
+                else None
+            ),
+            "coalesced_control_requests": self._coalesced_control_requests,
+            "inflight_command": (
+                {
+                    "state": self._inflight_command[0],
+                    "issued_at": self._inflight_command[1].isoformat(),
+                    "deadline": self._inflight_command[2].isoformat(),
+                    "attempt": self._inflight_command[3],
+                }
+                if self._inflight_command is not None
+                else None
+            ),
+            "suppressed_duplicate_commands": self._suppressed_duplicate_commands,
+            "command_retries": self._command_retries,
+            "actuator_unresponsive": self._actuator_unresponsive,
+            "pending_timers": self._timers.pending(),
+            "price_plan": self._price_planner.diagnostics if self._price_planner is not None else None,
+            "surplus": self._surplus_tracker.diagnostics if self._surplus_tracker is not None else None,
+            "power_budget_waiting": (
+                self._power_budget.is_waiting(self._device_identifier)
+                if self._power_budget is not None
+                else False
+            ),
+            "last_turn_on_stagger_s": self._last_turn_on_stagger,
+            "schedule_transitions": len(self._schedule.starts) if self._schedule is not None else 0,
+            "last_command_latency_s": self._last_command_latency,
+            "average_command_latency_s": self._average_command_latency,
+            "skipped_events": {
+                "temperature_sensor": self._skipped_sensor_events,
+                "heater_switch": self._skipped_switch_events,
+            },
         }
 
     @property
@@ -265,8 +419,7 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
         """Return the current running hvac operation if supported."""
         if self._current_operation == STATE_OFF:
             return "off"
-        heater = self.hass.states.get(self.heater_entity_id)
-        if heater and heater.state == STATE_ON:
+        if self._heater_state == STATE_ON:
             return "heating"
         return "idle"
 
@@ -327,8 +480,7 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
         old_mode = self._current_operation
 
         if operation_mode in (STATE_ELECTRIC, STATE_PERFORMANCE):
-            self._smart_eco_last_heating_mode = operation_mode
-            self._runtime["smart_eco_last_heating_mode"] = operation_mode
+            self._runtime.async_update(smart_eco_last_heating_mode=operation_mode)
 
         is_heating_boundary_change = (
             operation_mode == STATE_OFF
@@ -338,15 +490,15 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
             )
         )
 
-        if self._eco_template is not None and old_mode != operation_mode and is_heating_boundary_change:
-            if self._smart_eco_mode == SMART_ECO_MODE_AUTO_RESUME:
+        if self._has_eco_source and old_mode != operation_mode and is_heating_boundary_change:
+            if self._runtime.smart_eco_mode == SMART_ECO_MODE_AUTO_RESUME:
                 await self._async_pause_smart_eco_for_manual_override(
                     "manual_off" if operation_mode == STATE_OFF else "manual_on",
                     source="operation_mode",
                 )
             elif (
-                self._smart_eco_mode == SMART_ECO_MODE_UNTIL_MANUAL
-                and self._smart_eco_pause_reason is None
+                self._runtime.smart_eco_mode == SMART_ECO_MODE_UNTIL_MANUAL
+                and self._runtime.smart_eco_pause_reason is None
             ):
                 await self._async_pause_smart_eco_for_manual_override(
                     "manual_off" if operation_mode == STATE_OFF else "manual_on",
@@ -355,13 +507,15 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
 
         if (
             operation_mode == STATE_OFF
-            and self._smart_eco_mode == SMART_ECO_MODE_ALWAYS_ON
-            and self._eco_template is not None
+            and self._runtime.smart_eco_mode == SMART_ECO_MODE_ALWAYS_ON
+            and self._has_eco_source
         ):
             self._debug_log("ignoring manual OFF operation while Smart Eco mode is Always ON")
             await self._async_control_heating()
             return
 
+        # A manual mode lasts until the next schedule transition.
+        self._schedule_operation = None
         self._current_operation = operation_mode
         _LOGGER.debug("%s: async_set_operation_mode -> mode=%s", self.name, self._current_operation)
         if old_mode != operation_mode:
@@ -370,7 +524,7 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
 
     async def async_turn_on(self, **kwargs):
         """Turn the entity on."""
-        if self._smart_eco_mode == SMART_ECO_MODE_ALWAYS_ON and self._eco_template is not None:
+        if self._runtime.smart_eco_mode == SMART_ECO_MODE_ALWAYS_ON and self._has_eco_source:
             self._debug_log("ignoring manual turn_on while Smart Eco mode is Always ON")
             await self._async_control_heating()
             return
@@ -380,7 +534,7 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
 
     async def async_turn_off(self, **kwargs):
         """Turn the entity off."""
-        if self._smart_eco_mode == SMART_ECO_MODE_ALWAYS_ON and self._eco_template is not None:
+        if self._runtime.smart_eco_mode == SMART_ECO_MODE_ALWAYS_ON and self._has_eco_source:
             self._debug_log("ignoring manual turn_off while Smart Eco mode is Always ON")
             await self._async_control_heating()
             return
@@ -398,19 +552,13 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
         if mode not in (SMART_ECO_MODE_OFF, SMART_ECO_MODE_UNTIL_MANUAL, SMART_ECO_MODE_AUTO_RESUME, SMART_ECO_MODE_ALWAYS_ON):
             return
 
-        if self._smart_eco_mode == mode and self._smart_eco_pause_reason is None:
+        if self._runtime.smart_eco_mode == mode and self._runtime.smart_eco_pause_reason is None:
             return
 
-        self._smart_eco_mode = mode
-        self._runtime["smart_eco_mode"] = mode
+        self._runtime.async_update(smart_eco_mode=mode)
         self._clear_smart_eco_pause_state()
         self._debug_log("smart eco changed: mode=%s (source=%s)", mode, source)
         self._update_smart_eco_state()
-        async_dispatcher_send(self.hass, smart_eco_signal(self._device_identifier), mode)
-        async_dispatcher_send(self.hass, smart_eco_state_signal(self._device_identifier), self._runtime.get("smart_eco_state"))
-        select_entity = self._runtime.get("smart_eco_select_entity")
-        if select_entity is not None:
-            select_entity.async_write_ha_state()
         if recalculate:
             await self._async_control_heating()
 
@@ -439,14 +587,44 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
             )
         )
 
-        if self._eco_template:
-            info = async_track_template_result(
+        if self._eco_conditions is not None:
+            from .eco_conditions import EcoConditionTracker
+
+            self._eco_condition_tracker = EcoConditionTracker(
+                self.hass, self._eco_conditions, self._async_eco_source_changed
+            )
+            self.async_on_remove(self._eco_condition_tracker.async_start())
+        elif self._eco_price_sensor is not None:
+            from .price_plan import PricePlanner
+
+            self._price_planner = self._eco_condition_tracker = PricePlanner(
                 self.hass,
-                [TrackTemplate(self._eco_template, None)],
-                self._async_eco_template_changed,
+                self._eco_price_sensor,
+                self._eco_price_cheapest_slots,
+                self._eco_price_percentile,
+                self._async_eco_source_changed,
+                plan_changed=self._async_price_plan_changed,
+            )
+            self.async_on_remove(self._price_planner.async_start())
+        elif self._eco_surplus_sensor is not None:
+            from .surplus import SurplusTracker
+
+            self._surplus_tracker = self._eco_condition_tracker = SurplusTracker(
+                self.hass,
+                self._eco_surplus_sensor,
+                self._eco_surplus_power,
+                self._eco_surplus_window,
+                self._async_eco_source_changed,
+            )
+            self.async_on_remove(self._surplus_tracker.async_start())
+        elif self._eco_template:
+            from .eco_template import async_get_eco_template_evaluator
+
+            self.async_on_remove(
+                async_get_eco_template_evaluator(self.hass).async_subscribe(
+                    self._eco_template, self._async_eco_source_changed
+                )
             )
-            self.async_on_remove(info.async_remove)
-            info.async_refresh()
 
         old_state = await self.async_get_last_state()
         if old_state is not None:
@@ -463,28 +641,32 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
                 self._current_operation = STATE_OFF
             restored_mode = old_state.attributes.get("smart_eco_mode")
             if restored_mode in (SMART_ECO_MODE_OFF, SMART_ECO_MODE_UNTIL_MANUAL, SMART_ECO_MODE_AUTO_RESUME, SMART_ECO_MODE_ALWAYS_ON):
-                self._smart_eco_mode = restored_mode
-                self._runtime["smart_eco_mode"] = restored_mode
+                self._runtime.async_update(smart_eco_mode=restored_mode)
             else:
                 restored_smart_eco = old_state.attributes.get("smart_eco_enabled")
                 if isinstance(restored_smart_eco, bool):
-                    self._smart_eco_mode = SMART_ECO_MODE_AUTO_RESUME if restored_smart_eco else SMART_ECO_MODE_OFF
-                    self._runtime["smart_eco_mode"] = self._smart_eco_mode
+                    self._runtime.async_update(
+                        smart_eco_mode=SMART_ECO_MODE_AUTO_RESUME if restored_smart_eco else SMART_ECO_MODE_OFF
+                    )
 
             restored_pause_reason = old_state.attributes.get("smart_eco_pause_reason")
             if isinstance(restored_pause_reason, str):
-                self._smart_eco_pause_reason = restored_pause_reason
-                self._runtime["smart_eco_pause_reason"] = restored_pause_reason
+                self._runtime.async_update(smart_eco_pause_reason=restored_pause_reason)
 
             restored_resume_at = old_state.attributes.get("smart_eco_resume_at")
             if isinstance(restored_resume_at, str):
-                self._smart_eco_resume_at = restored_resume_at
-                self._runtime["smart_eco_resume_at"] = restored_resume_at
+                self._runtime.async_update(smart_eco_resume_at=restored_resume_at)
 
             restored_last_heating_mode = old_state.attributes.get("smart_eco_last_heating_mode")
             if restored_last_heating_mode in (STATE_ELECTRIC, STATE_PERFORMANCE):
-                self._smart_eco_last_heating_mode = restored_last_heating_mode
-                self._runtime["smart_eco_last_heating_mode"] = restored_last_heating_mode
+                self._runtime.async_update(smart_eco_last_heating_mode=restored_last_heating_mode)
+
+            restored_applied_at = old_state.attributes.get("schedule_applied_at")
+            if isinstance(restored_applied_at, str):
+                self._schedule_applied_at = dt_util.parse_datetime(restored_applied_at)
+            restored_schedule_operation = old_state.attributes.get("schedule_operation_mode")
+            if restored_schedule_operation in (STATE_ELECTRIC, STATE_PERFORMANCE, STATE_OFF):
+                self._schedule_operation = restored_schedule_operation
         
         # Ensure target temperature is set if not restored (e.g. new entity)
         if self._target_temperature is None:
@@ -498,6 +680,7 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
             self._current_temperature = float(temp_sensor.state)
 
         heater_switch = self.hass.states.get(self.heater_entity_id)
+        self._heater_state = heater_switch.state if heater_switch is not None else None
         if heater_switch and heater_switch.state not in (
             STATE_UNAVAILABLE,
             STATE_UNKNOWN,
@@ -505,13 +688,27 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
             self._attr_available = True
             self._last_commanded_switch_state = heater_switch.state
 
-        if self._smart_eco_pause_reason == "manual_off_timer" and self._smart_eco_resume_at:
-            resume_at = dt_util.parse_datetime(self._smart_eco_resume_at)
+        if self._power_budget_settings is not None:
+            from .power_budget import async_get_power_budget
+
+            self._power_budget = async_get_power_budget(self.hass)
+            self.async_on_remove(
+                self._power_budget.async_register(
+                    self._device_identifier,
+                    self._power_budget_settings,
+                    self._async_power_budget_granted,
+                )
+            )
+            if self._heater_state == STATE_ON:
+                self._power_budget.async_mark_on(self._device_identifier)
+
+        if self._runtime.smart_eco_pause_reason == "manual_off_timer" and self._runtime.smart_eco_resume_at:
+            resume_at = dt_util.parse_datetime(self._runtime.smart_eco_resume_at)
             if resume_at is not None:
                 remaining = (resume_at - dt_util.utcnow()).total_seconds()
                 if remaining > 0:
-                    self._smart_eco_resume_timer = async_call_later(
-                        self.hass,
+                    self._timers.schedule(
+                        _TIMER_SMART_ECO_RESUME,
                         remaining,
                         self._async_resume_smart_eco_from_timer,
                     )
@@ -519,13 +716,119 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
                 else:
                     self._clear_smart_eco_pause_state()
 
+        if self._schedule is not None:
+            # Restored settings, including manual changes, are kept unless a
+            # transition fired while Home Assistant was stopped.
+            if (
+                self._schedule_applied_at is None
+                or self._schedule_applied_at < self._schedule.previous_transition(dt_util.utcnow())
+            ):
+                self._apply_schedule_block()
+            self._arm_schedule_timer()
+
         self._async_refresh_eco_condition()
         self._update_smart_eco_state()
         await self._async_control_heating()
+        self._async_schedule_write()
+
+    async def async_apply_options(self, data: dict) -> None:
+        """Apply options that do not need a reload to the running entity.
+
+        Switch history, cooldowns, Smart Eco state and timers are kept, so a
+        pending cooldown is re-evaluated against the new durations.
+        """
+        self._target_temperature_step = data.get(CONF_TEMP_STEP)
+        self._cold_tolerance = data.get(CONF_COLD_TOLERANCE, 0.0)
+        self._hot_tolerance = data.get(CONF_HOT_TOLERANCE, 0.0)
+        self._min_temp = data.get(CONF_TEMP_MIN, 15.0)
+        self._max_temp = data.get(CONF_TEMP_MAX, 80.0)
+        min_on_duration = _duration_option(data, CONF_MIN_ON_DURATION)
+        min_off_duration = _duration_option(data, CONF_MIN_OFF_DURATION)
+        self._min_on_duration = min_on_duration if min_on_duration else timedelta(seconds=0)
+        self._min_off_duration = min_off_duration if min_off_duration else timedelta(seconds=120)
+        self._debug_logging = bool(data.get(CONF_DEBUG_LOGGING, False))
+        # A running override keeps its deadline; the new delay applies to the next one.
+        self._smart_eco_manual_off_resume_hours = int(data.get(CONF_SMART_ECO_MANUAL_OFF_RESUME_HOURS, 6))
+        self._switch_confirm_timeout = float(
+            data.get(CONF_SWITCH_CONFIRM_TIMEOUT) or DEFAULT_SWITCH_CONFIRM_TIMEOUT
+        )
+
+        countdown_state = bool(data.get(CONF_SMART_ECO_COUNTDOWN_STATE, False))
+        if countdown_state != self._smart_eco_countdown_state:
+            self._smart_eco_countdown_state = countdown_state
+            if countdown_state:
+                self._schedule_smart_eco_countdown_tick()
+            else:
+                self._timers.cancel(_TIMER_SMART_ECO_COUNTDOWN)
+            self._update_smart_eco_state()
+
+        from .power_budget import budget_settings
+
+        power_budget_settings = budget_settings(data)
+        if self._power_budget is not None and power_budget_settings != self._power_budget_settings:
+            self._power_budget.async_update_settings(self._device_identifier, power_budget_settings)
+        self._power_budget_settings = power_budget_settings
+
+        schedule = _schedule_option(data, self.name)
+        if schedule != self._schedule:
+            self._schedule = schedule
+            self._arm_schedule_timer()
+            if schedule is not None:
+                self._apply_schedule_block()
+            else:
+                self._schedule_applied_at = None
+                self._schedule_operation = None
+
+        self._debug_log("options applied without reload")
+        await self._async_control_heating()
+        self._async_schedule_write()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Drop any queued state write and pending timers."""
+        await super().async_will_remove_from_hass()
+        if self._write_handle is not None:
+            self._write_handle.cancel()
+            self._write_handle = None
+        self._timers.cancel_all()
+
+    @callback
+    def _async_schedule_write(self) -> None:
+        """Mark the entity dirty and write its state once per loop iteration.
+
+        A single control pass can touch state from several branches and event
+        handlers; coalescing them means one state_changed event per pass at most.
+        """
+        if self._write_handle is not None:
+            return
+        self._write_handle = self.hass.loop.call_soon(self._async_flush_write)
+
+    @callback
+    def _async_flush_write(self) -> None:
+        """Write the state if it differs from the last written snapshot."""
+        self._write_handle = None
+        if self.hass is None or self.entity_id is None:
+            return
+
+        snapshot = (
+            self.available,
+            self.state,
+            self.capability_attributes,
+            self.state_attributes,
+            self.extra_state_attributes,
+        )
+        if snapshot == self._last_written_snapshot:
+            return
+
+        self._last_written_snapshot = snapshot
         self.async_write_ha_state()
 
     async def _async_sensor_changed(self, event):
         """Handle temperature changes."""
+        if _is_attribute_only_change(event):
+            # Battery/linkquality style attribute updates cannot change the decision.
+            self._skipped_sensor_events += 1
+            return
+
         new_state = event.data.get("new_state")
         if new_state is None or new_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
             # Failsafe
@@ -560,57 +863,73 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
     def _async_refresh_eco_condition(self, result=None):
         """Refresh the current eco condition state."""
         previous = self._eco_condition_met
-        if self._eco_template is None:
+        if not self._has_eco_source:
             self._eco_condition_met = False
             if previous != self._eco_condition_met:
                 self._debug_log("eco condition changed: %s -> %s", previous, self._eco_condition_met)
             return
 
         if result is None:
-            try:
-                result = self._eco_template.async_render(parse_result=False)
-            except TemplateError as err:
-                _LOGGER.warning("%s: eco template render failed: %s", self.name, err)
-                self._eco_condition_met = False
-                if previous != self._eco_condition_met:
-                    self._debug_log("eco condition changed: %s -> %s", previous, self._eco_condition_met)
-                return
+            if self._eco_condition_tracker is not None:
+                result = self._eco_condition_tracker.result
+            else:
+                from .eco_template import async_get_eco_template_evaluator
+
+                result = async_get_eco_template_evaluator(self.hass).result(self._eco_template)
 
-        self._eco_condition_met = result_as_boolean(result)
+        # Render errors are logged once by the evaluator and count as not met.
+        self._eco_condition_met = result is True
         if previous != self._eco_condition_met:
             self._debug_log("eco condition evaluated: template_result=%s, meets_condition=%s", result, self._eco_condition_met)
             self._debug_log("eco condition changed: %s -> %s", previous, self._eco_condition_met)
 
-    async def _async_eco_template_changed(
+    async def _async_eco_source_changed(
         self,
+        result: bool | TemplateError,
         event: Event[EventStateChangedData] | None,
-        updates: list[TrackTemplateResult],
     ) -> None:
-        """Handle eco template updates."""
-        update = updates.pop()
-        result = update.result
-
-        if isinstance(result, TemplateError):
-            _LOGGER.warning("%s: eco template update failed: %s", self.name, result)
-            self._eco_condition_met = False
-        else:
-            self._async_refresh_eco_condition(result)
+        """Handle eco template or structured condition result changes."""
+        self._async_refresh_eco_condition(result)
 
         if event:
             self.async_set_context(event.context)
 
         self._update_smart_eco_state()
-        self.async_write_ha_state()
+        self._async_schedule_write()
 
         if self._is_smart_eco_enforcing():
             await self._async_control_heating()
 
+    @callback
+    def _async_price_plan_changed(self) -> None:
+        """Publish the price plan and the start of the next window."""
+        self._price_plan_attribute = [
+            {"start": start.isoformat(), "end": end.isoformat()}
+            for start, end in self._price_planner.windows
+        ]
+        next_window = self._price_planner.next_window_start(dt_util.utcnow())
+        self._runtime.async_update(
+            smart_eco_next_window=next_window.isoformat() if next_window is not None else None
+        )
+        self._async_schedule_write()
+
     @callback
     def _async_switch_changed(self, event):
         """Handle heater switch state changes."""
+        if _is_attribute_only_change(event):
+            self._skipped_switch_events += 1
+            return
+
         old_state = event.data.get("old_state")
         new_state = event.data.get("new_state")
+        self._heater_state = new_state.state if new_state is not None else None
         _LOGGER.debug("New switch state = %s", new_state)
+        if self._power_budget is not None:
+            # Count manual turn-ons too; only a confirmed OFF frees capacity.
+            if self._heater_state == STATE_ON:
+                self._power_budget.async_mark_on(self._device_identifier)
+            elif self._heater_state == STATE_OFF:
+                self._power_budget.async_release(self._device_identifier)
         if new_state is None or new_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
             self._attr_available = False
         else:
@@ -624,6 +943,7 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
             )
 
             self._last_switch_change_time = dt_util.utcnow()
+            self._confirm_inflight_command(new_state.state)
             state_changed = old_state is not None and old_state.state != new_state.state
             had_pending = self._pending_switch_state is not None
 
@@ -633,9 +953,8 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
                 self._last_commanded_switch_state = old_state.state
 
             # A real switch state change supersedes any delayed action that was queued.
-            if state_changed and self._cooldown_timer is not None:
-                self._cooldown_timer()
-                self._cooldown_timer = None
+            if state_changed and self._timers.is_scheduled(_TIMER_COOLDOWN):
+                self._timers.cancel(_TIMER_COOLDOWN)
                 self._debug_log(
                     "cooldown timer canceled due to switch state change: %s -> %s",
                     old_state.state,
@@ -676,7 +995,7 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
 
         self._debug_log_hvac_action("switch state update")
         self._update_smart_eco_state()
-        self.async_write_ha_state()
+        self._async_schedule_write()
 
     async def _async_handle_manual_switch_override(self, new_switch_state: str) -> None:
         """Translate manual switch actions into operation mode intent."""
@@ -793,26 +1112,18 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
     def _is_smart_eco_enforcing(self) -> bool:
         """Return whether Smart Eco policy is currently enforcing heater control."""
         return (
-            self._eco_template is not None
-            and self._smart_eco_mode in (SMART_ECO_MODE_UNTIL_MANUAL, SMART_ECO_MODE_AUTO_RESUME, SMART_ECO_MODE_ALWAYS_ON)
-            and self._smart_eco_pause_reason is None
+            self._has_eco_source
+            and self._runtime.smart_eco_mode in (SMART_ECO_MODE_UNTIL_MANUAL, SMART_ECO_MODE_AUTO_RESUME, SMART_ECO_MODE_ALWAYS_ON)
+            and self._runtime.smart_eco_pause_reason is None
         )
 
     def _clear_smart_eco_pause_state(self) -> None:
         """Clear Smart Eco pause flags and timers."""
-        self._smart_eco_pause_reason = None
-        self._smart_eco_resume_at = None
         self._smart_eco_idle_since = None
-        self._runtime["smart_eco_pause_reason"] = None
-        self._runtime["smart_eco_resume_at"] = None
-
-        if self._smart_eco_resume_timer is not None:
-            self._smart_eco_resume_timer()
-            self._smart_eco_resume_timer = None
+        self._runtime.async_update(smart_eco_pause_reason=None, smart_eco_resume_at=None)
 
-        if self._smart_eco_countdown_timer is not None:
-            self._smart_eco_countdown_timer()
-            self._smart_eco_countdown_timer = None
+        self._timers.cancel(_TIMER_SMART_ECO_RESUME)
+        self._timers.cancel(_TIMER_SMART_ECO_COUNTDOWN)
 
         persistent_notification.async_dismiss(
             self.hass,
@@ -827,13 +1138,13 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
     def _start_manual_override_countdown(self, action: str, source: str) -> None:
         """Start a Smart Eco temporary override countdown using configured delay."""
         self._clear_smart_eco_pause_state()
-        self._smart_eco_pause_reason = "manual_off_timer"
         resume_at = dt_util.utcnow() + timedelta(hours=self._smart_eco_manual_off_resume_hours)
-        self._smart_eco_resume_at = resume_at.isoformat()
-        self._runtime["smart_eco_pause_reason"] = self._smart_eco_pause_reason
-        self._runtime["smart_eco_resume_at"] = self._smart_eco_resume_at
-        self._smart_eco_resume_timer = async_call_later(
-            self.hass,
+        self._runtime.async_update(
+            smart_eco_pause_reason="manual_off_timer",
+            smart_eco_resume_at=resume_at.isoformat(),
+        )
+        self._timers.schedule(
+            _TIMER_SMART_ECO_RESUME,
             self._smart_eco_manual_off_resume_hours * 3600,
             self._async_resume_smart_eco_from_timer,
         )
@@ -869,13 +1180,16 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
 
     def _format_resume_countdown_state(self) -> str:
         """Return a human-readable countdown state label."""
-        if not self._smart_eco_resume_at:
+        if not self._runtime.smart_eco_resume_at:
             return "Paused by manual control"
 
-        resume_at = dt_util.parse_datetime(self._smart_eco_resume_at)
+        resume_at = dt_util.parse_datetime(self._runtime.smart_eco_resume_at)
         if resume_at is None:
             return "Paused by manual control"
 
+        if not self._smart_eco_countdown_state:
+            return "Resume scheduled"
+
         remaining = resume_at - dt_util.utcnow()
         remaining_seconds = max(0, int(remaining.total_seconds()))
         hours = remaining_seconds // 3600
@@ -884,17 +1198,17 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
 
     def _update_smart_eco_state(self) -> None:
         """Calculate and publish Smart Eco state label."""
-        if self._smart_eco_mode == SMART_ECO_MODE_OFF or self._eco_template is None:
+        if self._runtime.smart_eco_mode == SMART_ECO_MODE_OFF or not self._has_eco_source:
             state = "Off"
-        elif self._smart_eco_pause_reason == "until_manual":
+        elif self._runtime.smart_eco_pause_reason == "until_manual":
             state = "Stopped by manual control"
-        elif self._smart_eco_pause_reason == "manual_off_timer":
+        elif self._runtime.smart_eco_pause_reason == "manual_off_timer":
             countdown_state = self._format_resume_countdown_state()
-            if self._smart_eco_mode == SMART_ECO_MODE_ALWAYS_ON:
+            if self._runtime.smart_eco_mode == SMART_ECO_MODE_ALWAYS_ON:
                 state = f"Always ON override ({countdown_state})"
             else:
                 state = countdown_state
-        elif self._smart_eco_pause_reason == "manual_on_wait_idle":
+        elif self._runtime.smart_eco_pause_reason == "manual_on_wait_idle":
             state = "Paused by manual control"
         elif self._is_smart_eco_enforcing() and not self._eco_condition_met:
             state = "Blocked by eco condition"
@@ -903,57 +1217,57 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
         else:
             state = "Idle"
 
-        self._runtime["smart_eco_state"] = state
-        async_dispatcher_send(self.hass, smart_eco_state_signal(self._device_identifier), state)
+        self._runtime.async_update(smart_eco_state=state)
 
     def _schedule_smart_eco_countdown_tick(self) -> None:
-        """Schedule periodic countdown state refresh while waiting to resume."""
-        if self._smart_eco_pause_reason != "manual_off_timer":
+        """Schedule the next countdown label change while waiting to resume."""
+        if not self._smart_eco_countdown_state or self._runtime.smart_eco_pause_reason != "manual_off_timer":
             return
 
-        if self._smart_eco_countdown_timer is not None:
-            self._smart_eco_countdown_timer()
+        resume_at = dt_util.parse_datetime(self._runtime.smart_eco_resume_at or "")
+        if resume_at is None:
+            return
 
-        self._smart_eco_countdown_timer = async_call_later(
-            self.hass,
-            60,
+        # Wake when the displayed minute changes rather than on a fixed period.
+        remaining = (resume_at - dt_util.utcnow()).total_seconds()
+        if remaining <= 0:
+            return
+        self._timers.schedule(
+            _TIMER_SMART_ECO_COUNTDOWN,
+            remaining % 60 or 60,
             self._async_smart_eco_countdown_tick,
         )
 
     async def _async_smart_eco_countdown_tick(self, _now) -> None:
         """Refresh countdown state and reschedule while timer is active."""
-        self._smart_eco_countdown_timer = None
         self._update_smart_eco_state()
-        self.async_write_ha_state()
-        if self._smart_eco_pause_reason == "manual_off_timer":
+        self._async_schedule_write()
+        if self._runtime.smart_eco_pause_reason == "manual_off_timer":
             self._schedule_smart_eco_countdown_tick()
 
     async def _async_resume_smart_eco_from_timer(self, _now) -> None:
         """Resume Smart Eco when the manual OFF delay expires."""
-        self._smart_eco_resume_timer = None
-        if self._smart_eco_mode not in (SMART_ECO_MODE_AUTO_RESUME, SMART_ECO_MODE_ALWAYS_ON) or self._smart_eco_pause_reason != "manual_off_timer":
+        if self._runtime.smart_eco_mode not in (SMART_ECO_MODE_AUTO_RESUME, SMART_ECO_MODE_ALWAYS_ON) or self._runtime.smart_eco_pause_reason != "manual_off_timer":
             return
 
         self._debug_log("smart eco resume timer elapsed; resuming policy control")
         self._clear_smart_eco_pause_state()
-        if self._smart_eco_mode == SMART_ECO_MODE_ALWAYS_ON:
+        if self._runtime.smart_eco_mode == SMART_ECO_MODE_ALWAYS_ON:
             self._notify_always_on_override_resumed()
         self._update_smart_eco_state()
         await self._async_control_heating()
 
     def _async_check_manual_on_resume(self) -> None:
         """Resume Smart Eco after manual ON once target has been satisfied for 60s."""
-        if self._smart_eco_pause_reason != "manual_on_wait_idle" or self._smart_eco_mode != SMART_ECO_MODE_AUTO_RESUME:
+        if self._runtime.smart_eco_pause_reason != "manual_on_wait_idle" or self._runtime.smart_eco_mode != SMART_ECO_MODE_AUTO_RESUME:
             return
 
         now = dt_util.utcnow()
         if self.hvac_action == "idle" and self._current_operation in (STATE_ELECTRIC, STATE_PERFORMANCE):
             if self._smart_eco_idle_since is None:
                 self._smart_eco_idle_since = now
-                if self._smart_eco_resume_timer is not None:
-                    self._smart_eco_resume_timer()
-                self._smart_eco_resume_timer = async_call_later(
-                    self.hass,
+                self._timers.schedule(
+                    _TIMER_SMART_ECO_RESUME,
                     60,
                     self._async_resume_smart_eco_after_idle,
                 )
@@ -963,8 +1277,7 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
 
     async def _async_resume_smart_eco_after_idle(self, _now) -> None:
         """Resume Smart Eco after sustained idle following manual ON override."""
-        self._smart_eco_resume_timer = None
-        if self._smart_eco_pause_reason != "manual_on_wait_idle" or self._smart_eco_mode != SMART_ECO_MODE_AUTO_RESUME:
+        if self._runtime.smart_eco_pause_reason != "manual_on_wait_idle" or self._runtime.smart_eco_mode != SMART_ECO_MODE_AUTO_RESUME:
             return
 
         if self.hvac_action == "idle" and self._current_operation in (STATE_ELECTRIC, STATE_PERFORMANCE):
@@ -976,12 +1289,49 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
 
         self._async_check_manual_on_resume()
 
+    @callback
+    def _arm_schedule_timer(self) -> None:
+        """Arm the timer for the next schedule transition, or cancel it."""
+        if self._schedule is None:
+            self._timers.cancel(_TIMER_SCHEDULE)
+            return
+        now = dt_util.utcnow()
+        delay = (self._schedule.next_transition(now) - now).total_seconds()
+        self._timers.schedule(_TIMER_SCHEDULE, delay, self._async_schedule_transition)
+
+    async def _async_schedule_transition(self, _now) -> None:
+        """Apply the block that just started and arm the next transition."""
+        self._arm_schedule_timer()
+        self._apply_schedule_block()
+        await self._async_control_heating()
+
+    @callback
+    def _apply_schedule_block(self) -> None:
+        """Apply the active schedule block; the caller runs the control pass.
+
+        The schedule is not manual control, so unlike the entity services this
+        leaves Smart Eco pauses and the last heating mode alone.
+        """
+        now = dt_util.utcnow()
+        block = self._schedule.active_block(now)
+        self._debug_log(
+            "schedule block active: temperature=%s, operation_mode=%s",
+            block.temperature,
+            block.operation_mode,
+        )
+        if block.temperature is not None:
+            self._target_temperature = block.temperature
+        if block.operation_mode is not None:
+            self._current_operation = block.operation_mode
+            self._schedule_operation = block.operation_mode
+        self._schedule_applied_at = now
+
     async def _async_pause_smart_eco_for_manual_override(self, action: str, source: str) -> None:
         """Pause or stop Smart Eco according to current policy mode and override action."""
-        if self._smart_eco_mode == SMART_ECO_MODE_OFF or self._eco_template is None:
+        if self._runtime.smart_eco_mode == SMART_ECO_MODE_OFF or not self._has_eco_source:
             return
 
-        if self._smart_eco_mode == SMART_ECO_MODE_ALWAYS_ON:
+        if self._runtime.smart_eco_mode == SMART_ECO_MODE_ALWAYS_ON:
             if source != "manual_switch":
                 self._debug_log("manual override ignored by Always ON policy (source=%s)", source)
                 return
@@ -989,16 +1339,12 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
             self._start_manual_override_countdown(action, source)
             self._notify_always_on_override_started(action)
             self._update_smart_eco_state()
-            async_dispatcher_send(self.hass, smart_eco_signal(self._device_identifier), self._smart_eco_mode)
             return
 
-        if self._smart_eco_mode == SMART_ECO_MODE_UNTIL_MANUAL:
-            self._smart_eco_pause_reason = "until_manual"
-            self._runtime["smart_eco_pause_reason"] = self._smart_eco_pause_reason
-            self._runtime["smart_eco_resume_at"] = None
+        if self._runtime.smart_eco_mode == SMART_ECO_MODE_UNTIL_MANUAL:
+            self._runtime.async_update(smart_eco_pause_reason="until_manual", smart_eco_resume_at=None)
             self._debug_log("smart eco stopped by manual control (source=%s)", source)
             self._update_smart_eco_state()
-            async_dispatcher_send(self.hass, smart_eco_signal(self._device_identifier), self._smart_eco_mode)
             return
 
         # Auto-resume mode pause behavior.
@@ -1008,15 +1354,35 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
             self._start_manual_override_countdown(action, source)
         else:
             self._clear_smart_eco_pause_state()
-            self._smart_eco_pause_reason = "manual_on_wait_idle"
-            self._runtime["smart_eco_pause_reason"] = self._smart_eco_pause_reason
-            self._runtime["smart_eco_resume_at"] = None
+            self._runtime.async_update(smart_eco_pause_reason="manual_on_wait_idle")
             self._debug_log("smart eco paused by manual ON until satisfied (source=%s)", source)
 
         self._update_smart_eco_state()
-        async_dispatcher_send(self.hass, smart_eco_signal(self._device_identifier), self._smart_eco_mode)
 
     async def _async_control_heating(self):
+        """Run a control pass, coalescing requests made while one is in flight.
+
+        Passes await service calls, so sensor events, template updates and timers
+        can request control concurrently. Only one pass runs at a time; any
+        requests that arrive meanwhile collapse into a single follow-up pass,
+        which reads the latest inputs when it starts.
+        """
+        if self._control_running:
+            self._control_rerun = True
+            self._coalesced_control_requests += 1
+            return
+
+        self._control_running = True
+        try:
+            while True:
+                self._control_rerun = False
+                await self._async_control_heating_pass()
+                if not self._control_rerun:
+                    break
+        finally:
+            self._control_running = False
+
+    async def _async_control_heating_pass(self):
         """Check if we need to turn heating on or off."""
         _LOGGER.debug(
             "%s: control_heating start -> operation=%s, current_temperature=%s, target=%s, cold_tolerance=%s, hot_tolerance=%s",
@@ -1033,8 +1399,8 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
             self._current_operation,
             self._current_temperature,
             self._target_temperature,
-            self._smart_eco_mode,
-            self._smart_eco_pause_reason,
+            self._runtime.smart_eco_mode,
+            self._runtime.smart_eco_pause_reason,
             self._eco_condition_met,
         )
 
@@ -1047,11 +1413,13 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
                 await self._async_heater_turn_off()
                 self._update_smart_eco_state()
                 self._debug_log_hvac_action("smart eco blocked")
-                self.async_write_ha_state()
+                self._async_schedule_write()
                 return
 
-            if self._current_operation == STATE_OFF:
-                desired_heating_mode = self._smart_eco_last_heating_mode
+            if self._current_operation == STATE_OFF and self._schedule_operation == STATE_OFF:
+                self._debug_log("decision: smart eco allows heating, but the schedule keeps mode OFF")
+            elif self._current_operation == STATE_OFF:
+                desired_heating_mode = self._schedule_operation or self._runtime.smart_eco_last_heating_mode
                 if desired_heating_mode not in (STATE_ELECTRIC, STATE_PERFORMANCE):
                     desired_heating_mode = STATE_ELECTRIC
                 self._debug_log(
@@ -1068,7 +1436,7 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
             await self._async_heater_turn_off()
             self._debug_log_hvac_action("mode OFF")
             self._update_smart_eco_state()
-            self.async_write_ha_state()
+            self._async_schedule_write()
             return
 
         # Logic for PERFORMANCE: Heat continuously while not blocked by Smart Eco.
@@ -1078,7 +1446,7 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
             await self._async_heater_turn_on()
             self._debug_log_hvac_action("mode PERFORMANCE")
             self._update_smart_eco_state()
-            self.async_write_ha_state()
+            self._async_schedule_write()
             return
 
         # If we don't have the required temperature information, just update state
@@ -1088,8 +1456,9 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
         ):
             _LOGGER.debug("%s: missing temperature/target, skipping control", self.name)
             self._debug_log("decision: skip control due to missing temperature or target")
+            self._async_release_power_budget()
             self._debug_log_hvac_action("missing temperature/target")
-            self.async_write_ha_state()
+            self._async_schedule_write()
             return
 
         # Control heating based on tolerance
@@ -1117,23 +1486,172 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
         else:
             # Else: stay in current state (hysteresis band)
             self._debug_log("decision: within hysteresis band [%.1f, %.1f], maintaining current state", lower_threshold, upper_threshold)
+            # An idle heater stays off here, so it must not keep capacity it was granted.
+            self._async_release_power_budget()
 
         self._debug_log_hvac_action("hysteresis control")
-        if self._smart_eco_pause_reason == "manual_on_wait_idle":
+        if self._runtime.smart_eco_pause_reason == "manual_on_wait_idle":
             self._async_check_manual_on_resume()
         self._update_smart_eco_state()
-        self.async_write_ha_state()
+        self._async_schedule_write()
+
+    def _power_budget_deficit(self) -> float:
+        """Return how far the water is below the turn-on threshold."""
+        if self._current_temperature is None or self._target_temperature is None:
+            return 0.0
+        return max(0.0, self._target_temperature - self._cold_tolerance - self._current_temperature)
+
+    @callback
+    def _async_release_power_budget(self) -> None:
+        """Give up a queued request, an unused reservation or a staggered slot.
+
+        Capacity is kept while the switch is on or a turn-on is awaiting its echo.
+        """
+        if self._power_budget is None or self._expected_heater_state(dt_util.utcnow()) == STATE_ON:
+            return
+        self._power_budget.async_release(self._device_identifier)
+        self._timers.cancel(_TIMER_TURN_ON_STAGGER)
+
+    async def _async_power_budget_granted(self) -> None:
+        """Run a control pass once the site power budget admits this heater."""
+        self._debug_log("power budget: capacity granted")
+        await self._async_control_heating()
+
+    async def _async_turn_on_slot_reached(self, _now) -> None:
+        """Re-run control once this heater's staggered turn-on slot is reached."""
+        self._debug_log("power budget: staggered turn_on slot reached")
+        await self._async_control_heating()
 
     async def _async_control_heating_callback(self, _now):
         """Callback for delayed control heating."""
-        self._cooldown_timer = None
         self._pending_switch_state = None
         self._debug_log("cooldown timer fired: retrying control heating")
         await self._async_control_heating()
 
+    def _is_command_in_flight(self, state: str, now) -> bool:
+        """Return whether a command for this state is still awaiting its echo."""
+        return (
+            self._inflight_command is not None
+            and self._inflight_command[0] == state
+            and now < self._inflight_command[2]
+        )
+
+    def _expected_heater_state(self, now) -> str | None:
+        """Return the switch state expected once any in-flight command lands."""
+        if self._inflight_command is not None and now < self._inflight_command[2]:
+            return self._inflight_command[0]
+        return self._heater_state
+
+    def _confirm_inflight_command(self, new_switch_state: str) -> None:
+        """Record actuator round-trip latency when the commanded state is observed."""
+        if self._inflight_command is None or self._inflight_command[0] != new_switch_state:
+            return
+
+        latency = (dt_util.utcnow() - self._inflight_command[1]).total_seconds()
+        self._inflight_command = None
+        self._timers.cancel(_TIMER_COMMAND_WATCHDOG)
+        if self._actuator_unresponsive:
+            self._actuator_unresponsive = False
+            _LOGGER.info("%s: heater switch %s is responding again", self.name, self.heater_entity_id)
+            ir.async_delete_issue(self.hass, DOMAIN, self._unresponsive_issue_id)
+        self._last_command_latency = latency
+        if self._average_command_latency is None:
+            self._average_command_latency = latency
+        else:
+            self._average_command_latency += (latency - self._average_command_latency) * 0.2
+        self._debug_log("switch confirmed %s after %.2fs", new_switch_state, latency)
+
+    @property
+    def _unresponsive_issue_id(self) -> str:
+        """Return the repair issue id used for an unresponsive heater switch."""
+        return f"unresponsive_switch_{self._device_identifier}"
+
+    async def _async_send_switch_command(self, state: str, now, attempt: int = 1) -> None:
+        """Send a switch command and arm its confirmation watchdog."""
+        timeout = self._switch_confirm_timeout * 2 ** (attempt - 1)
+        self._inflight_command = (state, now, now + timedelta(seconds=timeout), attempt)
+        self._timers.schedule(_TIMER_COMMAND_WATCHDOG, timeout, self._async_command_watchdog_fired)
+
+        service = SERVICE_TURN_ON if state == STATE_ON else SERVICE_TURN_OFF
+        self._debug_log("service call: %s entity_id=%s (attempt %s)", service, self.heater_entity_id, attempt)
+        data = {ATTR_ENTITY_ID: self.heater_entity_id}
+        await self.hass.services.async_call(
+            HA_DOMAIN, service, data, context=self._context
+        )
+        self._debug_log("service call completed: %s entity_id=%s", service, self.heater_entity_id)
+
+    async def _async_command_watchdog_fired(self, _now) -> None:
+        """Re-send an unconfirmed switch command with backoff."""
+        if self._inflight_command is None:
+            return
+
+        state, _issued_at, _deadline, attempt = self._inflight_command
+        if self._heater_state == state:
+            self._confirm_inflight_command(state)
+            return
+
+        if self._last_commanded_switch_state != state:
+            # Control has moved on to the opposite state; let it issue its own command.
+            self._inflight_command = None
+            return
+
+        if attempt >= _MAX_COMMAND_ATTEMPTS:
+            self._inflight_command = None
+            self._async_mark_actuator_unresponsive(state, attempt)
+            return
+
+        _LOGGER.warning(
+            "%s: heater switch %s did not confirm %s; retrying (attempt %s of %s)",
+            self.name,
+            self.heater_entity_id,
+            state,
+            attempt + 1,
+            _MAX_COMMAND_ATTEMPTS,
+        )
+        self._command_retries += 1
+        await self._async_send_switch_command(state, dt_util.utcnow(), attempt + 1)
+
+    @callback
+    def _async_mark_actuator_unresponsive(self, state: str, attempts: int) -> None:
+        """Flag the heater switch as unresponsive and raise a repair issue."""
+        self._actuator_unresponsive = True
+        _LOGGER.error(
+            "%s: heater switch %s did not confirm %s after %s attempts",
+            self.name,
+            self.heater_entity_id,
+            state,
+            attempts,
+        )
+        ir.async_create_issue(
+            self.hass,
+            DOMAIN,
+            self._unresponsive_issue_id,
+            is_fixable=False,
+            severity=ir.IssueSeverity.ERROR,
+            translation_key="unresponsive_switch",
+            translation_placeholders={
+                "name": str(self.name),
+                "switch": self.heater_entity_id,
+                "state": state,
+                "attempts": str(attempts),
+            },
+        )
+        self._async_schedule_write()
+
     async def _async_heater_turn_on(self):
         """Turn heater toggleable device on."""
         now = dt_util.utcnow()
+        if self._is_command_in_flight(STATE_ON, now):
+            self._suppressed_duplicate_commands += 1
+            self._debug_log("service call suppressed: turn_on already awaiting confirmation")
+            return
+
+        if self._expected_heater_state(now) == STATE_ON:
+            # Nothing to do; skip the cooldown bookkeeping below.
+            self._last_commanded_switch_state = STATE_ON
+            self._pending_switch_state = None
+            return
+
         if self._last_switch_change_time:
             delta = now - self._last_switch_change_time
             if delta < self._min_off_duration:
@@ -1149,30 +1667,50 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
                     remaining,
                     remaining,
                 )
-                if self._cooldown_timer:
-                    self._cooldown_timer()
                 self._debug_log("cooldown timer started for turn_on retry (%.1fs)", remaining)
-                self._cooldown_timer = async_call_later(self.hass, remaining, self._async_control_heating_callback)
+                self._timers.schedule(_TIMER_COOLDOWN, remaining, self._async_control_heating_callback)
                 return
 
             self._pending_switch_state = None
         self._last_commanded_switch_state = STATE_ON
-        heater = self.hass.states.get(self.heater_entity_id)
-        if heater is None or heater.state == STATE_ON:
+        if self._heater_state is None:
+            return
+
+        if self._power_budget is not None and not self._power_budget.async_request(
+            self._device_identifier, self._power_budget_deficit()
+        ):
+            self._debug_log("power budget: turn_on waiting for site capacity")
+            self._async_schedule_write()
+            return
+
+        if self._power_budget is not None and (
+            delay := self._power_budget.async_turn_on_delay(self._device_identifier)
+        ):
+            if not self._timers.is_scheduled(_TIMER_TURN_ON_STAGGER):
+                self._last_turn_on_stagger = round(delay, 1)
+                self._debug_log("power budget: turn_on staggered by %.1fs", delay)
+                self._timers.schedule(_TIMER_TURN_ON_STAGGER, delay, self._async_turn_on_slot_reached)
             return
 
         _LOGGER.debug("Turning on heater %s", self.heater_entity_id)
-        self._debug_log("service call: turn_on entity_id=%s", self.heater_entity_id)
         self._last_switch_change_time = now
-        data = {ATTR_ENTITY_ID: self.heater_entity_id}
-        await self.hass.services.async_call(
-            HA_DOMAIN, SERVICE_TURN_ON, data, context=self._context
-        )
-        self._debug_log("service call completed: turn_on entity_id=%s", self.heater_entity_id)
+        await self._async_send_switch_command(STATE_ON, now)
 
     async def _async_heater_turn_off(self):
         """Turn heater toggleable device off."""
+        self._async_release_power_budget()
         now = dt_util.utcnow()
+        if self._is_command_in_flight(STATE_OFF, now):
+            self._suppressed_duplicate_commands += 1
+            self._debug_log("service call suppressed: turn_off already awaiting confirmation")
+            return
+
+        if self._expected_heater_state(now) == STATE_OFF:
+            # Nothing to do; skip the cooldown bookkeeping below.
+            self._last_commanded_switch_state = STATE_OFF
+            self._pending_switch_state = None
+            return
+
         if self._last_switch_change_time:
             delta = now - self._last_switch_change_time
             if delta < self._min_on_duration:
@@ -1188,23 +1726,15 @@ class GenericWaterHeater(WaterHeaterEntity, RestoreEntity):
                     remaining,
                     remaining,
                 )
-                if self._cooldown_timer:
-                    self._cooldown_timer()
                 self._debug_log("cooldown timer started for turn_off retry (%.1fs)", remaining)
-                self._cooldown_timer = async_call_later(self.hass, remaining, self._async_control_heating_callback)
+                self._timers.schedule(_TIMER_COOLDOWN, remaining, self._async_control_heating_callback)
                 return
 
             self._pending_switch_state = None
         self._last_commanded_switch_state = STATE_OFF
-        heater = self.hass.states.get(self.heater_entity_id)
-        if heater is None or heater.state == STATE_OFF:
+        if self._heater_state is None:
             return
 
         _LOGGER.debug("Turning off heater %s", self.heater_entity_id)
-        self._debug_log("service call: turn_off entity_id=%s", self.heater_entity_id)
         self._last_switch_change_time = now
-        data = {ATTR_ENTITY_ID: self.heater_entity_id}
-        await self.hass.services.async_call(
-            HA_DOMAIN, SERVICE_TURN_OFF, data, context=self._context
-        )
-        self._debug_log("service call completed: turn_off entity_id=%s", self.heater_entity_id)
\ No newline at end of file
+        await self._async_send_switch_command(STATE_OFF, now)
\ No newline at end of file
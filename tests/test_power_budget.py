@@ -0,0 +1,45 @@
+"""Tests for the site power budget."""
+from unittest.mock import MagicMock
+
+from custom_components.generic_water_heater.power_budget import BudgetSettings, PowerBudget
+
+
+def _budget(stagger: float, max_delay: float, heaters: int) -> PowerBudget:
+    """Return a budget with the given stagger settings and registered heaters."""
+    hass = MagicMock()
+    hass.loop.time.return_value = 1000.0
+    budget = PowerBudget(hass)
+    settings = BudgetSettings(5, 1.0, 0, 0.0, stagger, max_delay)
+    for index in range(heaters):
+        budget.async_register(f"heater_{index}", settings, lambda: None)
+    return budget
+
+
+def test_turn_on_burst_is_staggered_within_max_delay() -> None:
+    """A burst that fits the maximum delay gets slots one stagger apart."""
+    budget = _budget(5, 30, 7)
+
+    delays = [budget.async_turn_on_delay(f"heater_{index}") for index in range(7)]
+
+    assert delays == [0.0, 5.0, 10.0, 15.0, 20.0, 25.0, 30.0]
+
+
+def test_turn_on_burst_past_max_delay_keeps_minimum_gap() -> None:
+    """Turn-ons that do not fit the maximum delay follow one second apart."""
+    budget = _budget(5, 30, 20)
+
+    delays = [budget.async_turn_on_delay(f"heater_{index}") for index in range(20)]
+
+    assert delays[:7] == [0.0, 5.0, 10.0, 15.0, 20.0, 25.0, 30.0]
+    assert delays[7:] == [31.0 + index for index in range(13)]
+    assert all(later - earlier >= 1.0 for earlier, later in zip(delays, delays[1:]))
+
+
+def test_isolated_turn_on_is_not_delayed() -> None:
+    """A turn-on long after the previous slot is sent straight away."""
+    budget = _budget(5, 30, 2)
+    assert budget.async_turn_on_delay("heater_0") == 0.0
+
+    budget.hass.loop.time.return_value = 2000.0
+
+    assert budget.async_turn_on_delay("heater_1") == 0.0